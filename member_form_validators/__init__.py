@@ -1,4 +1,28 @@
-from .form_validators import DeceasedMemberFormValidator
-from .form_validators import HouseholdInfoFormValidator
-from .form_validators import HouseholdMemberFormValidator
-from .form_validators import HtcMemberFormValidator
+from .lazy import lazy_attributes
+
+# imported on first access, see lazy_attributes
+lazy_attributes(__name__, {
+    '.columnar': ['Columns', 'RuleFailure', 'evaluate_rules'],
+    '.form_validators': [
+        'DeceasedMemberFormValidator', 'HouseholdInfoFormValidator',
+        'HouseholdMemberFormValidator', 'HtcMemberFormValidator'],
+    '.household_log_entry_cache': [
+        'HouseholdLogEntryCache', 'household_log_entry_cache'],
+    '.household_structures': [
+        'get_previous_household_structures', 'prefetch_previous_household_structures'],
+    '.household_snapshot': [
+        'HouseholdSnapshot', 'discard_household_snapshots', 'get_household_snapshot',
+        'household_visit'],
+    '.instrumentation': [
+        'CollectorSink', 'HistogramSink', 'LoggingSink', 'Instrumentation',
+        'instrumentation'],
+    '.model_class': ['ModelClass', 'reset_model_classes'],
+    '.previous_member_index': ['PreviousMemberIndex', 'previous_member_index'],
+    '.relations': ['is_valid_relation', 'load_relations_by_gender', 'relations_by_gender'],
+    '.representative_eligibility_cache': [
+        'RepresentativeEligibilityCache', 'representative_eligibility_cache'],
+    '.result_cache': ['ValidationResultCache', 'validation_result_cache'],
+    '.rules': ['RuleFormValidator', 'Rule', 'compile_rules'],
+    '.tracing': ['Tracer', 'tracer'],
+    '.rules_export': ['RULES_DOCUMENT_VERSION', 'rules_document'],
+})
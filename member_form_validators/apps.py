@@ -5,6 +5,13 @@ from django.conf import settings
 class AppConfig(DjangoAppConfig):
     name = 'member_form_validators'
 
+    def ready(self):
+        from .signals import household_member_on_post_save_or_delete
+        from .signals import household_log_entry_on_post_save_or_delete
+        from .signals import deceased_member_on_post_save_or_delete
+        from .signals import representative_eligibility_on_post_save
+        from .signals import representative_eligibility_on_post_delete
+
 
 if settings.APP_NAME == 'member_form_validators':
 
@@ -0,0 +1,43 @@
+import asyncio
+
+from django.db import close_old_connections
+from threading import current_thread, main_thread
+
+
+def _call(func, *args):
+    try:
+        return func(*args)
+    finally:
+        if current_thread() is not main_thread():
+            close_old_connections()
+
+
+async def run_in_thread(func, *args, executor=None):
+    """Runs func(*args) in a thread of `executor` (the loop's default
+    if None) so that its ORM queries do not block the event loop.
+
+    Each thread uses its own database connection, closed as per
+    CONN_MAX_AGE when done (except in the main thread).
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, _call, func, *args)
+
+
+async def gather_in_threads(funcs, executor=None):
+    """Runs each func concurrently in threads and returns a list of
+    results, in order, with any exception raised in place of the
+    result.
+    """
+    return await asyncio.gather(
+        *[run_in_thread(func, executor=executor) for func in funcs],
+        return_exceptions=True)
+
+
+class AsyncFormValidatorMixin:
+    """Adds `avalidate`, the async counterpart of `validate`.
+
+    By default `validate` runs in a thread.
+    """
+
+    async def avalidate(self, executor=None):
+        return await run_in_thread(self.validate, executor=executor)
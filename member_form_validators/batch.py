@@ -0,0 +1,28 @@
+from django import forms
+
+
+def validate_rows(form_validator_cls, rows, **options):
+    """Returns a list of (errors, error_codes), one per row, in the
+    format of `_errors` and `_error_codes`.
+
+    `rows` is a list of dictionaries of `cleaned_data` and `instance`.
+    Uses the form validator's `validate_many`, if it has one.
+    """
+    if hasattr(form_validator_cls, 'validate_many'):
+        return form_validator_cls.validate_many(rows, **options)
+    results = []
+    for row in rows:
+        form_validator = form_validator_cls(**row)
+        try:
+            form_validator.validate()
+        except forms.ValidationError:
+            pass
+        results.append((form_validator._errors, form_validator._error_codes))
+    return results
+
+
+def error_messages(errors):
+    """Returns `_errors` as a dictionary of lists of strings.
+    """
+    return {field: forms.ValidationError(value).messages
+            for field, value in errors.items()}
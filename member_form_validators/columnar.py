@@ -0,0 +1,152 @@
+from collections import namedtuple
+from edc_constants.constants import NOT_APPLICABLE, OTHER
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .rules import compile_rules
+
+# rows are the indices of the failing rows, field is the field in error
+RuleFailure = namedtuple('RuleFailure', 'rule field rows')
+
+
+class Columns:
+    """The columns of a dataset, e.g. a survey's household members,
+    as {field: sequence of values}, for `evaluate_rules`.
+
+    Each column is encoded once as an array of integer codes of its
+    distinct values so that a rule is evaluated per distinct value
+    and then as boolean masks over the rows.
+
+    `present` is an optional {field: sequence of booleans} of the
+    rows in which the field is present, by default all rows.
+
+    Requires numpy, see extras "columnar".
+    """
+
+    def __init__(self, columns=None, present=None):
+        if np is None:
+            raise ImportError('Columnar rule evaluation requires numpy.')
+        self.columns = {}
+        lengths = set()
+        for field, values in (columns or {}).items():
+            index = {}
+            codes = np.fromiter(
+                (index.setdefault(value, len(index)) for value in values), dtype=np.intp)
+            self.columns[field] = (codes, list(index))
+            lengths.add(len(codes))
+        if len(lengths) > 1:
+            raise ValueError(f'Columns must be of equal length. Got {sorted(lengths)}.')
+        self.length = lengths.pop() if lengths else 0
+        self.present = {
+            field: np.fromiter(mask, dtype=bool, count=self.length)
+            for field, mask in (present or {}).items()}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Returns Columns of a list of cleaned_data dictionaries.
+
+        A field missing from some rows is None, and not present, in
+        those rows.
+        """
+        rows = list(rows)
+        fields = set(field for row in rows for field in row)
+        return cls(
+            {field: [row.get(field) for row in rows] for field in fields},
+            present={field: [field in row for row in rows] for field in fields
+                     if not all(field in row for row in rows)})
+
+    @classmethod
+    def from_queryset(cls, queryset, fields):
+        """Returns Columns of the fields of the queryset, fetched with
+        one query.
+        """
+        rows = list(queryset.values_list(*fields))
+        return cls({field: [row[i] for row in rows] for i, field in enumerate(fields)})
+
+    def is_present(self, field):
+        """Returns a boolean mask of the rows in which the field is
+        present, as `field in cleaned_data`.
+        """
+        if field not in self.columns:
+            return np.zeros(self.length, dtype=bool)
+        try:
+            return self.present[field]
+        except KeyError:
+            return np.ones(self.length, dtype=bool)
+
+    def where(self, field, predicate):
+        """Returns a boolean mask of the rows for which
+        predicate(value) is true, value is None if no column.
+        """
+        try:
+            codes, values = self.columns[field]
+        except KeyError:
+            return np.full(self.length, bool(predicate(None)))
+        return np.array([bool(predicate(value)) for value in values], dtype=bool)[codes]
+
+
+def _required_if(rule, columns):
+    condition = columns.where(rule.field, lambda value: value in rule.responses)
+    required = columns.where(rule.target, lambda value: not value or value == NOT_APPLICABLE)
+    return columns.is_present(rule.field) & (
+        (condition & required) | (~condition & ~required))
+
+
+def _required_if_not_none(rule, columns):
+    condition = columns.where(rule.field, lambda value: value is not None)
+    return ((condition & columns.where(rule.target, lambda value: not value))
+            | (~condition & columns.where(
+                rule.target, lambda value: value and value != NOT_APPLICABLE)))
+
+
+def _applicable_if(rule, columns, inverse=False):
+    condition = columns.where(rule.field, lambda value: value in rule.responses)
+    if inverse:
+        condition = ~condition
+    not_applicable = columns.where(rule.target, lambda value: value == NOT_APPLICABLE)
+    return (columns.is_present(rule.field) & columns.is_present(rule.target) & (
+        (condition & not_applicable) | (~condition & ~not_applicable)))
+
+
+def _not_applicable_if(rule, columns):
+    return _applicable_if(rule, columns, inverse=True)
+
+
+def _validate_other_specify(rule, columns):
+    specified = columns.where(rule.target, bool)
+    return ((columns.where(rule.field, lambda value: value and value == OTHER)
+             & ~specified)
+            | (columns.where(rule.field, lambda value: value and value != OTHER)
+               & specified))
+
+
+# {Rule check: function returning the mask of failing rows}, as the
+# FormValidator methods of the same name with their default options.
+rule_masks = {
+    'required_if': _required_if,
+    'required_if_not_none': _required_if_not_none,
+    'applicable_if': _applicable_if,
+    'not_applicable_if': _not_applicable_if,
+    'validate_other_specify': _validate_other_specify,
+}
+
+
+def evaluate_rules(rules, columns):
+    """Returns a list of RuleFailure, one per rule with failing rows,
+    of evaluating the rules, e.g. `HtcMemberFormValidator.rules`,
+    over all rows of the columns.
+
+    Every rule is evaluated for every row, as with
+    collect_all_errors, instead of stopping at a row's first error.
+    """
+    if not isinstance(columns, Columns):
+        columns = Columns(columns)
+    failures = []
+    for rule in compile_rules(rules):
+        rows = np.flatnonzero(rule_masks[rule.check](rule, columns))
+        if len(rows):
+            failures.append(RuleFailure(rule, rule.target, rows))
+    return failures
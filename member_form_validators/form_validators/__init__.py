@@ -1,5 +1,10 @@
-from .deceased_member import DeceasedMemberFormValidator
-from .household_info import HouseholdInfoFormValidator
-from .household_member import HouseholdMemberFormValidator
-from .htc_member import HtcMemberFormValidator
-from .moved_member import MovedMemberFormValidator
+from ..lazy import lazy_attributes
+
+# validators, and their dependencies, are imported on first access
+lazy_attributes(__name__, {
+    '.deceased_member': ['DeceasedMemberFormValidator'],
+    '.household_info': ['HouseholdInfoFormValidator'],
+    '.household_member': ['HouseholdMemberFormValidator'],
+    '.htc_member': ['HtcMemberFormValidator'],
+    '.moved_member': ['MovedMemberFormValidator'],
+})
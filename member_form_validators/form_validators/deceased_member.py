@@ -1,11 +1,10 @@
-from edc_base.modelform_validators import FormValidator
+from ..rules import RuleFormValidator, required_if_not_none
 
 
-class DeceasedMemberFormValidator(FormValidator):
+class DeceasedMemberFormValidator(RuleFormValidator):
 
-    def clean(self):
-        
-        self.required_if_not_none(
+    rules = (
+        required_if_not_none(
             field='extra_death_info',
-            field_required='extra_death_info_date'
-        )
+            field_required='extra_death_info_date'),
+    )
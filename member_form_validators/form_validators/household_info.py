@@ -1,25 +1,48 @@
 from django import forms
-from django.apps import apps as django_apps
-from edc_base.modelform_validators import FormValidator
-from django.core.exceptions import ObjectDoesNotExist
 
+from ..asynchronous import AsyncFormValidatorMixin
+from ..household_snapshot import get_household_snapshot
+from ..model_class import ModelClass
+from ..rules import RuleFormValidator, other_specify
 
-class HouseholdInfoFormValidator(FormValidator):
+
+class HouseholdInfoFormValidator(AsyncFormValidatorMixin, RuleFormValidator):
 
     representative_eligibility_model = 'member.representativeeligibility'
+    representative_eligibility_model_cls = ModelClass(
+        'representative_eligibility_model')
+
+    # set to a RepresentativeEligibilityCache, e.g.
+    # representative_eligibility_cache, to cache the existence check
+    representative_eligibility_cache = None
+
+    rules = (
+        [other_specify(field) for field in [
+            'flooring_type', 'water_source', 'energy_source', 'toilet_facility']],
+    )
+
+    def __init__(self, household_snapshot=None, **kwargs):
+        super().__init__(**kwargs)
+        # if given or in a household_visit, representative eligibility
+        # is looked up in the household snapshot
+        self.household_snapshot = household_snapshot
 
     def clean(self):
-        representative_eligibility_model_cls = django_apps.get_model(
-            self.representative_eligibility_model)
-        try:
-            representative_eligibility_model_cls.objects.get(
-                household_structure=self.cleaned_data.get('household_structure'))
-        except ObjectDoesNotExist:
-            verbose_name = representative_eligibility_model_cls._meta.verbose_name
+        if not self.representative_eligibility_exists():
+            verbose_name = self.representative_eligibility_model_cls._meta.verbose_name
             raise forms.ValidationError(
                 f'Please complete {verbose_name} first.')
+        super().clean()
 
-        self.validate_other_specify('flooring_type')
-        self.validate_other_specify('water_source')
-        self.validate_other_specify('energy_source')
-        self.validate_other_specify('toilet_facility')
+    def representative_eligibility_exists(self):
+        household_structure = self.cleaned_data.get('household_structure')
+        household_snapshot = (
+            self.household_snapshot or get_household_snapshot(household_structure))
+        if household_snapshot:
+            return household_snapshot.representative_eligibility_exists
+        elif self.representative_eligibility_cache:
+            return self.representative_eligibility_cache.exists(
+                representative_eligibility_model_cls=self.representative_eligibility_model_cls,
+                household_structure=household_structure)
+        return self.representative_eligibility_model_cls.objects.filter(
+            household_structure=household_structure).exists()
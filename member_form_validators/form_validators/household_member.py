@@ -1,25 +1,130 @@
 from household.constants import REFUSED_ENUMERATION
 from household.exceptions import HouseholdLogRequired
-from member.choices import RELATIONS, FEMALE_RELATIONS, MALE_RELATIONS
 from member.constants import HEAD_OF_HOUSEHOLD
 
 from django import forms
-from django.apps import apps as django_apps
-from django.core.exceptions import ObjectDoesNotExist
-from edc_base.modelform_validators import FormValidator
+from django.core.exceptions import FieldDoesNotExist, NON_FIELD_ERRORS
 from edc_base.utils import get_utcnow
-from edc_constants.constants import YES, FEMALE, MALE, ALIVE, UNKNOWN, NO, DEAD
+from edc_constants.constants import YES, MALE, ALIVE, UNKNOWN, NO
 from household.utils import todays_log_entry_or_raise
 
+from ..asynchronous import gather_in_threads
+from ..household_log_entry_cache import HouseholdLogEntryCache
+from ..household_structures import get_previous_household_structures
+from ..household_structures import prefetch_previous_household_structures
+from ..household_snapshot import get_household_snapshot
+from ..instrumentation import instrumentation
+from ..model_class import ModelClass
+from ..previous_member_index import PreviousMemberIndex
+from ..relations import is_valid_relation, relations_by_gender
+from ..result_cache import fingerprint
+from ..rules import RuleFormValidator, applicable_if, required_if
 
-class HouseholdMemberFormValidator(FormValidator):
+
+class HouseholdMemberFormValidator(RuleFormValidator):
 
     household_member_model = 'member.householdmember'
     deceased_member_model = 'member.deceasedmember'
 
-    def __init__(self, today_datetime=None, **kwargs):
+    household_member_model_cls = ModelClass('household_member_model')
+    deceased_member_model_cls = ModelClass('deceased_member_model')
+
+    # set to a HouseholdLogEntryCache, e.g. household_log_entry_cache,
+    # to look up today's household log entry in an in-process cache
+    household_log_entry_cache = None
+
+    # set to a ValidationResultCache, e.g. validation_result_cache,
+    # to return the cached verdict of an unchanged resubmission
+    result_cache = None
+
+    # set to a PreviousMemberIndex, e.g. previous_member_index,
+    # to check previous surveys against an in-process index
+    previous_member_index = None
+
+    rules = (
+        applicable_if(NO, field='has_moved', field_applicable='present_today'),
+        applicable_if(ALIVE, field='survival_status', field_applicable='present_today'),
+        [applicable_if(YES, field='present_today', field_applicable=field)
+         for field in ['inability_to_participate', 'study_resident',
+                       'personal_details_changed', 'relation']],
+        required_if(
+            YES,
+            field='personal_details_changed',
+            field_required='details_change_reason'),
+    )
+
+    # if True, run every check and raise all errors together
+    # instead of raising on the first error.
+    collect_all_errors = False
+
+    # if True, when editing an existing member, skip the checks and
+    # rules whose fields, see depends_on, are unchanged from the
+    # instance. New members are always fully validated.
+    incremental = False
+
+    # {check or db getter: fields it depends on} of those skipped
+    # if incremental and none of the fields changed. Others always run,
+    # e.g. the survival status check that depends on deceased members.
+    depends_on = {
+        'validate_age_of_head_of_household': ['relation', 'age_in_years'],
+        'validate_relation_and_gender': ['relation', 'gender'],
+        'validate_initials_on_first_name': ['first_name', 'initials'],
+        'validate_member_integrity_with_previous': [
+            'household_structure', 'first_name', 'initials'],
+        'get_enumerated_in': ['household_structure', 'first_name', 'initials']}
+
+    # checks on cleaned_data and the instance only, run first
+    # so that a form with field errors fails before any query.
+    pure_checks = [
+        'validate_enrollment_checklist_completed',
+        'validate_age_of_head_of_household',
+        'validate_relation_and_gender',
+        'validate_initials_on_first_name',
+        'validate_rules']
+
+    # checks that query the database, in dependency order
+    db_checks = [
+        'validate_household_log_entry',
+        'validate_refused_enumeration',
+        'validate_member_integrity_with_previous',
+        'validate_survival_status']
+
+    # methods that query for the db_checks, independent of each other
+    db_getters = [
+        'get_household_log_entry',
+        'get_enumerated_in',
+        'get_deceased_site_aware_date']
+
+    def __init__(self, today_datetime=None, household_log_entry_cache=None,
+                 previous_member_index=None, deceased_members=None,
+                 household_snapshot=None, collect_all_errors=None, incremental=None,
+                 **kwargs):
         super().__init__(**kwargs)
+        if collect_all_errors is not None:
+            self.collect_all_errors = collect_all_errors
+        if incremental is not None:
+            self.incremental = incremental
+        self.collected_errors = {}
+        self.household_log_entry = None
+        self.prefetched = {}
+        if household_log_entry_cache:
+            self.household_log_entry_cache = household_log_entry_cache
+        if previous_member_index:
+            self.previous_member_index = previous_member_index
+        # a dictionary of {household_member pk: site_aware_date} of
+        # deceased members, if None, deceased members are queried
+        self.deceased_members = deceased_members
         self.household_structure = self.cleaned_data.get('household_structure')
+        # if given or in a household_visit, today's log entry, previous
+        # structures, members and deceased members are looked up in the
+        # household snapshot
+        self.household_snapshot = (
+            household_snapshot or get_household_snapshot(self.household_structure))
+        if self.household_snapshot:
+            if not household_log_entry_cache:
+                self.household_log_entry_cache = self.household_snapshot
+            if not previous_member_index:
+                self.previous_member_index = self.household_snapshot.previous_member_index
         self.first_name = self.cleaned_data.get('first_name')
         self.initials = self.cleaned_data.get('initials')
         self.relation = self.cleaned_data.get('relation')
@@ -35,36 +140,234 @@ class HouseholdMemberFormValidator(FormValidator):
                 'report_datetime', today_datetime or get_utcnow())
         else:
             self.report_datetime = today_datetime or self.instance.report_datetime
+        # the set of changed fields or None to run all checks
+        if self.incremental and self.instance.id:
+            self.changed_fields = self.get_changed_fields()
+        else:
+            self.changed_fields = None
+
+    @classmethod
+    def export_rules(cls):
+        """Returns the compiled rules and the pure checks that do not
+        depend on the instance as a list of dictionaries.
+        """
+        return super().export_rules() + [
+            dict(check='validate_age_of_head_of_household',
+                 field='age_in_years', relation=HEAD_OF_HOUSEHOLD, min_age=18,
+                 message='Head of Household must be 18 years or older.'),
+            dict(check='validate_relation_and_gender',
+                 field='relation', gender_field='gender',
+                 relations_by_gender={
+                     gender: sorted(relations)
+                     for gender, relations in relations_by_gender.items()},
+                 messages={
+                     gender: cls.invalid_relation_message(gender)
+                     for gender in relations_by_gender}),
+            dict(check='validate_initials_on_first_name',
+                 field='initials', first_name_field='first_name',
+                 message='Invalid initials. First name does not match first initial.')]
+
+    def validate(self):
+        """Validates or, if using a result cache, returns or raises
+        the cached verdict of an identical submission.
+
+        The pure checks run first so that a form with field errors
+        fails before any query.
+        """
+        key = None
+        if self.result_cache and self.pure_checks_pass():
+            key = self.result_cache_key()
+        if not key:
+            return super().validate()
+        try:
+            errors, error_codes, error = self.result_cache.get(key)
+        except KeyError:
+            pass
+        else:
+            self._errors.update(errors)
+            self._error_codes.extend(error_codes)
+            if error:
+                raise forms.ValidationError(error)
+            return self.cleaned_data
+        household_id = self.household_structure.household_id
+        try:
+            cleaned_data = super().validate()
+        except forms.ValidationError as e:
+            self.result_cache.set(
+                key, household_id, (dict(self._errors), list(self._error_codes), e))
+            raise
+        self.result_cache.set(key, household_id, ({}, [], None))
+        return cleaned_data
+
+    def result_cache_key(self):
+        """Returns a key of the submission, instance and today's
+        household log entry or None if there is no log entry.
+        """
+        if not self.household_structure:
+            return None
+        # kept for validate_household_log_entry
+        try:
+            household_log_entry = self.fetch('get_household_log_entry')
+        except HouseholdLogRequired as e:
+            self.prefetched['get_household_log_entry'] = e
+            return None
+        self.prefetched['get_household_log_entry'] = household_log_entry
+        return (
+            self.__class__.__name__, self.collect_all_errors, self.incremental,
+            fingerprint(self.cleaned_data),
+            str(self.instance.pk), str(getattr(self.instance, 'modified', None)),
+            str(household_log_entry.pk), str(household_log_entry.modified))
+
+    async def avalidate(self, executor=None):
+        """Async counterpart of `validate`.
+
+        If the pure checks pass (or all errors are collected), the
+        independent queries of the database-backed checks (today's
+        log entry, members of previous surveys and the deceased
+        member) run concurrently in threads before validating with
+        their results.
+        """
+        if self.pure_checks_pass() or self.collect_all_errors:
+            getters = [
+                getter for getter in self.db_getters if not self.is_unchanged(getter)]
+            results = await gather_in_threads(
+                [getattr(self, getter) for getter in getters], executor=executor)
+            self.prefetched = dict(zip(getters, results))
+        return self.validate()
+
+    def pure_checks_pass(self):
+        """Returns True if the pure checks pass, without keeping
+        their errors.
+        """
+        errors, error_codes = dict(self._errors), list(self._error_codes)
+        try:
+            for check in self.pure_checks:
+                getattr(self, check)()
+        except forms.ValidationError:
+            return False
+        finally:
+            self._errors, self._error_codes = errors, error_codes
+        return True
+
+    def fetch(self, getter):
+        """Returns the result of calling method `getter` or the
+        result prefetched by `avalidate`.
+        """
+        try:
+            result = self.prefetched.pop(getter)
+        except KeyError:
+            return getattr(self, getter)()
+        if isinstance(result, Exception):
+            raise result
+        return result
 
     def clean(self):
-        self.household_member_model_cls = django_apps.get_model(
-            self.household_member_model)
-        self.deceased_member_model_cls = django_apps.get_model(
-            self.deceased_member_model)
+        self.collected_errors = {}
+        for check in self.pure_checks + self.db_checks:
+            if not self.is_unchanged(check):
+                self.run_check(getattr(self, check), name=check)
+        if self.collected_errors:
+            raise forms.ValidationError(self.collected_errors)
+
+    def validate_rules(self):
+        for rule in self.compiled_rules:
+            if (self.changed_fields is None
+                    or self.changed_fields.intersection([rule.field, rule.target])):
+                self.run_check(rule.evaluate, self)
+
+    def get_changed_fields(self):
+        """Returns the set of names of the fields in cleaned_data
+        whose values differ from those of the instance.
+
+        Related fields are compared by pk, without a query.
+        """
+        changed_fields = set()
+        for name, value in self.cleaned_data.items():
+            try:
+                field = self.instance._meta.get_field(name)
+            except FieldDoesNotExist:
+                field = None
+            if not field or not field.concrete or field.many_to_many:
+                changed_fields.add(name)
+                continue
+            if field.is_relation:
+                value = getattr(value, 'pk', value)
+            if value != getattr(self.instance, field.attname):
+                changed_fields.add(name)
+        return changed_fields
+
+    def is_unchanged(self, name):
+        """Returns True if check or getter `name` may be skipped
+        because none of the fields it depends on changed.
+        """
+        fields = self.depends_on.get(name)
+        return bool(
+            self.changed_fields is not None and fields
+            and not self.changed_fields.intersection(fields))
 
-        # validate cannot change if enrollment_checklist_completed
+    def run_check(self, check, *args, name=None):
+        """Runs the check and, if collecting all errors, collects
+        its error instead of raising.
+
+        Named checks are timed if instrumentation is enabled.
+        """
+        try:
+            if name and instrumentation.enabled:
+                instrumentation.run(self, name, check, *args)
+            else:
+                check(*args)
+        except forms.ValidationError as e:
+            if not self.collect_all_errors:
+                raise
+            self.collect_error(e)
+
+    def collect_error(self, e):
+        try:
+            error_dict = e.error_dict
+        except AttributeError:
+            self.collected_errors.setdefault(NON_FIELD_ERRORS, []).extend(e.error_list)
+            if e.code and e.code not in self._error_codes:
+                self._error_codes.append(e.code)
+        else:
+            for field, errors in error_dict.items():
+                self.collected_errors.setdefault(field, []).extend(errors)
+
+    def validate_enrollment_checklist_completed(self):
+        """Validates cannot change if enrollment_checklist_completed.
+        """
         if self.instance.id and self.instance.enrollment_checklist_completed:
             raise forms.ValidationError(
                 'Enrollment checklist exists. This member may not be changed.',
                 code='enrollment_checklist_completed')
 
-        # require household log entry
+    def validate_household_log_entry(self):
+        """Validates a household log entry exists for today.
+        """
         try:
-            self.household_log_entry = todays_log_entry_or_raise(
-                household_structure=self.household_structure,
-                report_datetime=self.report_datetime)
+            self.household_log_entry = self.fetch('get_household_log_entry')
         except HouseholdLogRequired as e:
             raise forms.ValidationError(e, code='household_log_entry')
 
-        # validate_refused_enumeration
-        if self.household_log_entry.household_status == REFUSED_ENUMERATION:
+    def get_household_log_entry(self):
+        """Returns today's household log entry or raises
+        HouseholdLogRequired.
+        """
+        if self.household_log_entry_cache:
+            get_log_entry = self.household_log_entry_cache.todays_log_entry_or_raise
+        else:
+            get_log_entry = todays_log_entry_or_raise
+        return get_log_entry(
+            household_structure=self.household_structure,
+            report_datetime=self.report_datetime)
+
+    def validate_refused_enumeration(self):
+        if (self.household_log_entry
+                and self.household_log_entry.household_status == REFUSED_ENUMERATION):
             raise forms.ValidationError(
                 'Household log entry for today shows household status as refused '
                 'therefore you cannot add a member', code='refused_enumeration')
 
-        self.validate_member_integrity_with_previous()
-
-        # validate age of HoH
+    def validate_age_of_head_of_household(self):
         if self.relation == HEAD_OF_HOUSEHOLD and not self.age_in_years >= 18:
             raise forms.ValidationError({
                 'age_in_years': 'Head of Household must be 18 years or older.'})
@@ -75,9 +378,7 @@ class HouseholdMemberFormValidator(FormValidator):
                     f'You cannot change their age to less than 18. '
                     f'Got {self.age_in_years}.')})
 
-        self.validate_relation_and_gender()
-
-        # validate_initials_on_first_name
+    def validate_initials_on_first_name(self):
         try:
             assert self.first_name[0] == self.initials[0]
         except AssertionError:
@@ -86,75 +387,135 @@ class HouseholdMemberFormValidator(FormValidator):
         except TypeError:
             pass
 
+    def validate_survival_status(self):
+        """Validates an alive member was not reported as deceased.
+        """
         if self.survival_status in [ALIVE, UNKNOWN]:
-            try:
-                obj = self.deceased_member_model_cls.objects.get(
-                    household_member=self.instance)
-            except ObjectDoesNotExist:
-                pass
-            else:
-                aware_date = obj.site_aware_date.strftime('%Y-%m-%d')
+            site_aware_date = self.fetch('get_deceased_site_aware_date')
+            if site_aware_date:
+                aware_date = site_aware_date.strftime('%Y-%m-%d')
                 raise forms.ValidationError({
                     'survival_status': f'Member was reported as deceased on {aware_date}'})
-        
-        self.applicable_if(
-            NO,
-            field='has_moved',
-            field_applicable='present_today')
-
-        self.applicable_if(
-            ALIVE,
-            field='survival_status',
-            field_applicable='present_today'
-        )
-
-        moved_list = ['inability_to_participate', 'study_resident', 'personal_details_changed', 'relation']
-        
-        for opt in moved_list:
-            self.applicable_if(
-                YES,
-                field='present_today',
-                field_applicable=opt)
-
-        self.required_if(
-            YES,
-            field='personal_details_changed',
-            field_required='details_change_reason')
+
+    @classmethod
+    def validate_many(cls, rows, today_datetime=None, collect_all_errors=None):
+        """Validates many household members, e.g. a household's
+        worth of members from a tablet or the import tool.
+
+        `rows` is an iterable of dictionaries of `cleaned_data` and
+        `instance`.
+
+        Today's household log entries, deceased members and members
+        of previous surveys are fetched once per household structure.
+
+        Returns a list of (errors, error_codes), one per row, in the
+        format of `_errors` and `_error_codes`.
+        """
+        rows = list(rows)
+        # each row may have its own object of a household structure
+        household_structures = [
+            row.get('cleaned_data').get('household_structure') for row in rows]
+        prefetch_previous_household_structures(household_structures)
+        deceased_members = dict(
+            cls.deceased_member_model_cls.objects.filter(
+                household_member__household_structure__in=set(
+                    obj.pk for obj in household_structures if obj)).values_list(
+                        'household_member', 'site_aware_date'))
+        opts = dict(
+            today_datetime=today_datetime,
+            household_log_entry_cache=(
+                cls.household_log_entry_cache or HouseholdLogEntryCache()),
+            previous_member_index=cls.previous_member_index or PreviousMemberIndex(),
+            deceased_members=deceased_members,
+            collect_all_errors=collect_all_errors)
+        results = []
+        for row in rows:
+            form_validator = cls(
+                cleaned_data=row.get('cleaned_data'),
+                instance=row.get('instance'), **opts)
+            try:
+                form_validator.validate()
+            except forms.ValidationError:
+                pass
+            results.append((form_validator._errors, form_validator._error_codes))
+        return results
+
+    def get_deceased_site_aware_date(self):
+        """Returns the site aware date if this household member
+        was reported as deceased, otherwise None.
+
+        A new household member cannot be deceased so does not query.
+        """
+        if not self.instance.id:
+            return None
+        elif self.deceased_members is not None:
+            return self.deceased_members.get(self.instance.id)
+        elif self.household_snapshot:
+            return self.household_snapshot.deceased_members.get(self.instance.id)
+        return self.deceased_member_model_cls.objects.filter(
+            household_member=self.instance).values_list(
+                'site_aware_date', flat=True).first()
 
     def validate_member_integrity_with_previous(self):
         """Validates that this is not an attempt to ADD a member that
         already exists in a previous survey.
+
+        The error refers to the earliest survey the member was
+        enumerated in.
         """
         if not self.instance.id:
-            household_structure = self.household_structure
-            while household_structure:
-                household_structure = household_structure.previous
-                print(household_structure)
-                try:
-                    self.household_member_model_cls.objects.get(
-                        household_structure=household_structure,
-                        first_name=self.first_name,
-                        initials=self.initials)
-                except ObjectDoesNotExist:
-                    pass
-                else:
+            previous_structures, enumerated_in = self.fetch('get_enumerated_in')
+            for household_structure in reversed(previous_structures):
+                if household_structure.pk in enumerated_in:
+                    name = household_structure.survey_schedule_object.name
                     raise forms.ValidationError(
                         f'{self.first_name} with initials {self.initials} was '
-                        f'enumerated in {household_structure.survey_schedule_object.name}. '
+                        f'enumerated in {name}. '
                         'Please use the import tool to add this member to the current '
                         'survey.', code='use_import_tool')
 
+    def get_enumerated_in(self):
+        """Returns a tuple of the previous household structures and
+        the set of pks of those in which a member with this
+        first_name and initials was enumerated.
+
+        All previous household structures are checked in one query.
+        """
+        if self.instance.id:
+            return [], set()
+        previous_structures = self.get_previous_household_structures()
+        if not previous_structures:
+            enumerated_in = set()
+        elif self.previous_member_index:
+            enumerated_in = self.previous_member_index.lookup(
+                household_member_model_cls=self.household_member_model_cls,
+                household_structure=self.household_structure,
+                first_name=self.first_name,
+                initials=self.initials)
+        else:
+            enumerated_in = set(
+                self.household_member_model_cls.objects.filter(
+                    household_structure__in=previous_structures,
+                    first_name=self.first_name,
+                    initials=self.initials).values_list(
+                        'household_structure', flat=True).distinct())
+        return previous_structures, enumerated_in
+
+    def get_previous_household_structures(self):
+        """Returns a list of the household structures previous to
+        this one, most recent first.
+        """
+        if self.household_snapshot:
+            return self.household_snapshot.previous_household_structures
+        return get_previous_household_structures(self.household_structure)
+
     def validate_relation_and_gender(self):
-        if self.relation:
-            if self.gender == MALE:
-                relations = [
-                    item[0] for item in RELATIONS if item not in FEMALE_RELATIONS]
-                if self.relation not in relations:
-                    raise forms.ValidationError({
-                        'relation': 'Invalid relation for male.'})
-            elif self.gender == FEMALE:
-                relations = [
-                    item[0] for item in RELATIONS if item not in MALE_RELATIONS]
-                if self.relation not in relations:
-                    raise forms.ValidationError({
-                        'relation': 'Invalid relation for female.'})
+        if self.relation and not is_valid_relation(
+                relation=self.relation, gender=self.gender):
+            raise forms.ValidationError({
+                'relation': self.invalid_relation_message(self.gender)})
+
+    @staticmethod
+    def invalid_relation_message(gender):
+        gender = 'male' if gender == MALE else 'female'
+        return f'Invalid relation for {gender}.'
@@ -1,12 +1,12 @@
-from edc_base.modelform_validators import FormValidator
 from edc_constants.constants import YES, NO
 
+from ..rules import RuleFormValidator, applicable_if, required_if
 
-class HtcMemberFormValidator(FormValidator):
 
-    def clean(self):
-        self.required_if(
-            NO, field='accepted', field_required='refusal_reason')
-        self.applicable_if(YES, field='offered', field_applicable='referred')
-        self.required_if(
-            YES, field='referred', field_required='referral_clinic')
+class HtcMemberFormValidator(RuleFormValidator):
+
+    rules = (
+        required_if(NO, field='accepted', field_required='refusal_reason'),
+        applicable_if(YES, field='offered', field_applicable='referred'),
+        required_if(YES, field='referred', field_required='referral_clinic'),
+    )
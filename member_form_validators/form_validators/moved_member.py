@@ -1,47 +1,24 @@
 from django import forms
 
-from edc_base.modelform_validators import FormValidator
-from edc_constants.constants import YES, NO
+from edc_constants.constants import YES
 
+from ..rules import RuleFormValidator, not_applicable_if, required_if
 
-class MovedMemberFormValidator(FormValidator):
 
-    def clean(self):
+class MovedMemberFormValidator(RuleFormValidator):
 
-        self.required_if(
+    rules = (
+        required_if(
             YES,
             field='moved_community',
-            field_required='new_community')
-
-        self.not_applicable_if(
-            YES,
-            field='has_moved',
-            field_applicable='details_change_reason'
-        )
+            field_required='new_community'),
+        [not_applicable_if(YES, field='has_moved', field_applicable=field)
+         for field in ['details_change_reason', 'inability_to_participate',
+                       'study_resident', 'personal_details_changed']],
+    )
 
-        self.not_applicable_if(
-            YES,
-            field='has_moved',
-            field_applicable='inability_to_participate'
-        )
-
-        self.not_applicable_if(
-            YES,
-            field='has_moved',
-            field_applicable='study_resident'
-        )
-
-        self.not_applicable_if(
-            YES,
-            field='has_moved',
-            field_applicable='personal_details_changed'
-        )
-
-        self.not_applicable_if(
-            YES,
-            field='has_moved',
-            field_applicable='personal_details_changed'
-        )
+    def clean(self):
+        super().clean()
 
         if self.instance.id and self.instance.has_moved not in [YES]:
             raise forms.ValidationError(
@@ -0,0 +1,61 @@
+from threading import RLock
+from time import monotonic
+
+from household.utils import todays_log_entry_or_raise
+
+
+class HouseholdLogEntryCache:
+    """A short-lived in-process cache of today's household log entry
+    keyed by household structure and report date.
+
+    Only found log entries are cached. Entries for a household
+    structure are invalidated when any of its household log entries
+    is saved or deleted, see signals.
+    """
+
+    timeout = 60  # seconds
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or self.timeout
+        self._lock = RLock()
+        self._cache = {}
+        self._version = 0
+
+    def todays_log_entry_or_raise(self, household_structure=None, report_datetime=None):
+        """Returns today's household log entry or raises
+        HouseholdLogRequired, see household.utils.
+
+        Not cached if there is no household structure.
+        """
+        if household_structure is None:
+            return todays_log_entry_or_raise(
+                household_structure=household_structure,
+                report_datetime=report_datetime)
+        key = (household_structure.pk, report_datetime.date())
+        with self._lock:
+            expires, household_log_entry = self._cache.get(key, (0, None))
+            version = self._version
+        if expires > monotonic():
+            return household_log_entry
+        household_log_entry = todays_log_entry_or_raise(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        with self._lock:
+            if version == self._version:
+                self._cache[key] = (
+                    monotonic() + self.timeout, household_log_entry)
+        return household_log_entry
+
+    def invalidate(self, household_structure_id=None):
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == household_structure_id]:
+                del self._cache[key]
+            self._version += 1
+
+    def clear(self):
+        with self._lock:
+            self._cache = {}
+            self._version += 1
+
+
+household_log_entry_cache = HouseholdLogEntryCache()
@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+from threading import local
+
+from household.utils import todays_log_entry_or_raise
+
+from .household_structures import get_previous_household_structures
+from .model_class import ModelClass
+from .previous_member_index import PreviousMemberIndex
+
+_visit = local()
+
+
+class HouseholdSnapshot:
+    """The data of a household structure the form validators of a
+    household visit look up, served from memory once loaded.
+
+    Each part (today's log entry, the previous household structures,
+    the household's members across surveys, the deceased members and
+    whether a representative eligibility exists) is loaded with one
+    query on first use.
+
+    Pass to a validator as `household_snapshot` or open a
+    `household_visit` to look it up by household structure.
+    """
+
+    household_structure_model = 'household.householdstructure'
+    deceased_member_model = 'member.deceasedmember'
+    representative_eligibility_model = 'member.representativeeligibility'
+
+    household_structure_model_cls = ModelClass('household_structure_model')
+    deceased_member_model_cls = ModelClass('deceased_member_model')
+    representative_eligibility_model_cls = ModelClass(
+        'representative_eligibility_model')
+
+    def __init__(self, household_structure=None):
+        self.household_structure = household_structure
+        self.previous_member_index = PreviousMemberIndex()
+        self._log_entries = {}
+        self._deceased_members = None
+        self._representative_eligibility_exists = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.household_structure!r})'
+
+    def todays_log_entry_or_raise(self, household_structure=None, report_datetime=None):
+        """Returns today's household log entry or raises
+        HouseholdLogRequired, see household.utils.
+
+        Same signature as HouseholdLogEntryCache. Not served from the
+        snapshot if there is no household structure or it is not the
+        snapshot's.
+        """
+        if (household_structure is None or self.household_structure is None
+                or household_structure.pk != self.household_structure.pk):
+            return todays_log_entry_or_raise(
+                household_structure=household_structure,
+                report_datetime=report_datetime)
+        try:
+            return self._log_entries[report_datetime.date()]
+        except KeyError:
+            household_log_entry = todays_log_entry_or_raise(
+                household_structure=self.household_structure,
+                report_datetime=report_datetime)
+            self._log_entries[report_datetime.date()] = household_log_entry
+            return household_log_entry
+
+    @property
+    def previous_household_structures(self):
+        return get_previous_household_structures(self.household_structure)
+
+    @property
+    def deceased_members(self):
+        """Returns a dictionary of {household_member pk:
+        site_aware_date} of the deceased members.
+        """
+        if self._deceased_members is None:
+            self._deceased_members = dict(
+                self.deceased_member_model_cls.objects.filter(
+                    household_member__household_structure=self.household_structure
+                ).values_list('household_member', 'site_aware_date'))
+        return self._deceased_members
+
+    @property
+    def representative_eligibility_exists(self):
+        if self._representative_eligibility_exists is None:
+            self._representative_eligibility_exists = (
+                self.representative_eligibility_model_cls.objects.filter(
+                    household_structure=self.household_structure).exists())
+        return self._representative_eligibility_exists
+
+
+@contextmanager
+def household_visit():
+    """Shares a HouseholdSnapshot per household structure between
+    the form validators of a request or batch, in this thread.
+
+    A snapshot is discarded if a record it loaded changes, see
+    signals.
+    """
+    snapshots = getattr(_visit, 'snapshots', None)
+    _visit.snapshots = {}
+    try:
+        yield _visit.snapshots
+    finally:
+        _visit.snapshots = snapshots
+
+
+def get_household_snapshot(household_structure=None):
+    """Returns the HouseholdSnapshot of the household structure,
+    or its pk, in the current household visit or None if there is no
+    household visit.
+    """
+    snapshots = getattr(_visit, 'snapshots', None)
+    if snapshots is None or household_structure is None:
+        return None
+    pk = getattr(household_structure, 'pk', household_structure)
+    try:
+        return snapshots[pk]
+    except KeyError:
+        if pk == household_structure:
+            household_structure = (
+                HouseholdSnapshot.household_structure_model_cls.objects.get(pk=pk))
+        snapshots[pk] = HouseholdSnapshot(household_structure)
+        return snapshots[pk]
+
+
+def discard_household_snapshots(household_structure_id=None, household_id=None):
+    """Discards the snapshots of the household structure or of all
+    structures of the household, e.g. for members of previous
+    surveys, from the current household visit.
+    """
+    snapshots = getattr(_visit, 'snapshots', None)
+    for pk, snapshot in list((snapshots or {}).items()):
+        if (pk == household_structure_id
+                or snapshot.household_structure.household_id == household_id):
+            del snapshots[pk]
@@ -0,0 +1,66 @@
+from .tracing import tracer
+
+
+def previous_survey_schedules(household_structure):
+    """Returns the survey schedule field values previous to that of
+    the household structure, most recent first.
+    """
+    survey_schedules = []
+    survey_schedule = household_structure.survey_schedule_object.previous
+    while survey_schedule:
+        survey_schedules.append(survey_schedule.field_value)
+        survey_schedule = survey_schedule.previous
+    return survey_schedules
+
+
+def get_previous_household_structures(household_structure):
+    """Returns a list of the household structures previous to this
+    one, most recent first.
+
+    Resolved with one query instead of following `previous` and
+    memoised on the household structure.
+    """
+    if not household_structure:
+        return []
+    try:
+        return household_structure._previous_household_structures
+    except AttributeError:
+        prefetch_previous_household_structures([household_structure])
+        return household_structure._previous_household_structures
+
+
+def prefetch_previous_household_structures(household_structures):
+    """Resolves and memoises the previous household structures of
+    each household structure with one query for all of them.
+
+    Memoised on every object given, including several objects of
+    the same household structure.
+    """
+    household_structures = [obj for obj in household_structures if obj]
+    if not household_structures:
+        return
+    trace = tracer.start_trace('previous_household_structures')
+    survey_schedules = {}
+    for household_structure in household_structures:
+        if household_structure.pk not in survey_schedules:
+            survey_schedules[household_structure.pk] = previous_survey_schedules(
+                household_structure)
+            if trace:
+                trace.hop(household_structure.survey_schedule)
+    by_household = {}
+    model_cls = household_structures[0].__class__
+    if any(survey_schedules.values()):
+        queryset = model_cls.objects.filter(
+            household__in=set(obj.household_id for obj in household_structures),
+            survey_schedule__in=set(
+                value for values in survey_schedules.values() for value in values))
+        for obj in queryset:
+            by_household.setdefault(obj.household_id, {})[obj.survey_schedule] = obj
+    if trace:
+        trace.hop('query')
+        trace.finish()
+    for household_structure in household_structures:
+        structures = by_household.get(household_structure.household_id, {})
+        household_structure._previous_household_structures = [
+            structures[value] for value in survey_schedules[household_structure.pk]
+            if value in structures]
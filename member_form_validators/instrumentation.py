@@ -0,0 +1,203 @@
+import logging
+
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from threading import Lock
+from time import perf_counter
+
+
+class LoggingSink:
+    """Logs each timed check.
+    """
+
+    def __init__(self, logger=None, level=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level or logging.INFO
+
+    def record(self, validator, check, seconds, queries):
+        self.logger.log(
+            self.level, '%s.%s seconds=%.6f queries=%s',
+            validator, check, seconds, queries)
+
+
+class CollectorSink:
+    """A statsd-style local collector of counts, total seconds and
+    total queries by validator and check.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.queries = {}
+
+    def record(self, validator, check, seconds, queries):
+        key = f'{validator}.{check}'
+        with self._lock:
+            self.counts[key] += 1
+            self.seconds[key] += seconds
+            # None if queries were not counted, not 0
+            if queries is not None:
+                self.queries[key] = self.queries.get(key, 0) + queries
+
+    def flush(self):
+        """Returns the collected stats as a dictionary and resets.
+        """
+        with self._lock:
+            stats = {
+                key: dict(count=count, seconds=self.seconds[key],
+                          queries=self.queries.get(key))
+                for key, count in self.counts.items()}
+            self.reset()
+        return stats
+
+
+class HistogramSink:
+    """An in-memory histogram of seconds by validator and check.
+
+    Counts are by upper bound of `buckets` (seconds), the last
+    count is for anything slower.
+    """
+
+    buckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or self.buckets
+        self._lock = Lock()
+        self.histograms = {}
+
+    def record(self, validator, check, seconds, queries):
+        key = f'{validator}.{check}'
+        with self._lock:
+            histogram = self.histograms.setdefault(
+                key, [0] * (len(self.buckets) + 1))
+            histogram[bisect_left(self.buckets, seconds)] += 1
+
+
+class QueryCounter:
+    """Counts the queries executed on a connection, as an execute
+    wrapper, without the connection's debug query log.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class CountingCursorWrapper:
+    """Wraps a connection's cursor wrapper to count its queries
+    with a QueryCounter, for Django < 2.0.
+    """
+
+    def __init__(self, cursor, counter):
+        self.cursor = cursor
+        self.counter = counter
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.cursor.__exit__(exc_type, exc_value, traceback)
+
+    def execute(self, sql, params=None):
+        self.counter.count += 1
+        return self.cursor.execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        self.counter.count += 1
+        return self.cursor.executemany(sql, param_list)
+
+
+@contextmanager
+def counting_cursors(counter):
+    """Wraps the cursors made on this thread's default connection
+    with CountingCursorWrapper, for Django < 2.0.
+
+    Connections are per thread, so only this thread's queries are
+    counted.
+    """
+    db = connections[DEFAULT_DB_ALIAS]
+    patched = {}
+    for name in ['make_cursor', 'make_debug_cursor']:
+        make = getattr(db, name)
+        patched[name] = db.__dict__.get(name)
+        setattr(db, name, lambda cursor, make=make: CountingCursorWrapper(
+            make(cursor), counter))
+    try:
+        yield
+    finally:
+        for name, make in patched.items():
+            if make is None:
+                delattr(db, name)
+            else:
+                setattr(db, name, make)
+
+
+@contextmanager
+def query_counter():
+    """Yields a QueryCounter of the queries on this thread's default
+    connection.
+    """
+    counter = QueryCounter()
+    if hasattr(connection, 'execute_wrapper'):
+        with connection.execute_wrapper(counter):
+            yield counter
+    else:
+        with counting_cursors(counter):
+            yield counter
+
+
+class Instrumentation:
+    """Times named form validator checks and counts their queries,
+    emitting to each registered sink.
+
+    Disabled until a sink is added, callers check `enabled` before
+    calling `run` so that there is no overhead when disabled.
+    """
+
+    def __init__(self, count_queries=None):
+        self.count_queries = True if count_queries is None else count_queries
+        self.sinks = []
+        self.enabled = False
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+        self.enabled = bool(self.sinks)
+
+    def run(self, form_validator, name, check, *args):
+        """Runs and times check(*args) as check `name`.
+        """
+        start = perf_counter()
+        counter = None
+        try:
+            if self.count_queries:
+                with query_counter() as counter:
+                    return check(*args)
+            return check(*args)
+        finally:
+            seconds = perf_counter() - start
+            queries = None if counter is None else counter.count
+            for sink in self.sinks:
+                sink.record(
+                    form_validator.__class__.__name__, name, seconds, queries)
+
+
+instrumentation = Instrumentation()
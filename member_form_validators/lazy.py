@@ -0,0 +1,45 @@
+import sys
+
+from importlib import import_module
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """A module whose declared attributes are imported from their
+    submodules on first access.
+    """
+
+    def __getattr__(self, name):
+        try:
+            submodule = self.__dict__['_lazy_attributes'][name]
+        except KeyError:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+        value = getattr(import_module(submodule, self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # as with an eager import, a submodule does not replace the
+        # attribute of the same name, e.g. `instrumentation`.
+        if (isinstance(value, ModuleType)
+                and name in self.__dict__.get('_lazy_attributes', {})
+                and value.__name__ == f'{self.__name__}.{name}'):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._lazy_attributes))
+
+
+def lazy_attributes(module_name, attributes):
+    """Declares the attributes of module `module_name`, a dictionary
+    of {submodule: [names]}, to be imported on first access.
+
+    Swaps the module's class instead of a module level __getattr__,
+    which requires python 3.7.
+    """
+    module = sys.modules[module_name]
+    module._lazy_attributes = {
+        name: submodule for submodule, names in attributes.items() for name in names}
+    module.__all__ = sorted(module._lazy_attributes)
+    module.__class__ = LazyModule
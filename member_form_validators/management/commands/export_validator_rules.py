@@ -0,0 +1,24 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...rules_export import rules_document
+
+
+class Command(BaseCommand):
+
+    help = ('Exports the field rules of the member form validators as a '
+            'versioned JSON document for client-side pre-validation.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None,
+            help='File to write the JSON document to. Default: stdout')
+
+    def handle(self, *args, **options):
+        document = json.dumps(rules_document(), indent=2, sort_keys=True)
+        if options.get('output'):
+            with open(options.get('output'), 'w') as f:
+                f.write(document + '\n')
+        else:
+            self.stdout.write(document)
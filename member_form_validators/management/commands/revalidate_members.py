@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError, OutputWrapper
+
+from ...revalidation import revalidate_all, revalidation_registry
+
+
+class Command(BaseCommand):
+
+    help = ('Re-validates existing household members, moved members, deceased '
+            'members and household info against the current form validators '
+            'and reports failures as JSON lines.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', action='append', dest='labels', metavar='LABEL',
+            help=f'Model label to re-validate, may be repeated. '
+                 f'Default: {", ".join(revalidation_registry)}')
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help='Number of worker processes. Default: number of CPUs')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000, dest='chunk_size',
+            help='Number of records per chunk. Default: 1000')
+        parser.add_argument(
+            '--output', default=None,
+            help='File to write failures to. Default: stdout')
+
+    def handle(self, *args, **options):
+        labels = options.get('labels')
+        for label in labels or []:
+            if label not in revalidation_registry:
+                raise CommandError(
+                    f'Invalid model. Expected one of {list(revalidation_registry)}. '
+                    f'Got {label}.')
+        if options.get('output'):
+            output = OutputWrapper(open(options.get('output'), 'w'))
+        else:
+            output = self.stdout
+        counts = {}
+        try:
+            for label, pk, error_codes, errors in revalidate_all(
+                    labels=labels, processes=options.get('processes'),
+                    chunk_size=options.get('chunk_size')):
+                counts[label] = counts.get(label, 0) + 1
+                output.write(json.dumps(
+                    dict(model=label, pk=pk, codes=error_codes, errors=errors)))
+        finally:
+            if output is not self.stdout:
+                output.close()
+        for label, count in sorted(counts.items()):
+            self.stderr.write(f'{label}: {count} failed')
+        self.stderr.write(f'Done. {sum(counts.values())} failed.')
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...pipeline import import_registry, validate_file
+
+
+class Command(BaseCommand):
+
+    help = ('Validates the rows of an exported CSV or JSONL file against the '
+            'form validator of the model and reports failures as JSON lines.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file')
+        parser.add_argument(
+            '--model', default='member.householdmember',
+            help=f'Model label of the rows, one of {", ".join(import_registry)}. '
+                 f'Default: member.householdmember')
+        parser.add_argument(
+            '--format', default=None, dest='file_format', choices=['csv', 'jsonl'],
+            help='File format. Default: from the file extension')
+
+    def handle(self, *args, **options):
+        model = options.get('model')
+        if model not in import_registry:
+            raise CommandError(
+                f'Invalid model. Expected one of {list(import_registry)}. Got {model}.')
+        rows = failed = 0
+        try:
+            for result in validate_file(
+                    options.get('path'), model=model,
+                    file_format=options.get('file_format')):
+                rows += 1
+                if result.errors or result.error_codes:
+                    failed += 1
+                    self.stdout.write(json.dumps(result._asdict()))
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        self.stderr.write(f'Done. {failed} of {rows} rows failed.')
@@ -0,0 +1,39 @@
+from django.apps import apps as django_apps
+
+
+class ModelClass:
+    """A descriptor that returns the model class for the model label
+    in another attribute of the class, e.g.
+
+        household_member_model = 'member.householdmember'
+        household_member_model_cls = ModelClass('household_member_model')
+
+    The model class is resolved once the app registry is ready and
+    reused thereafter. Call `reset_model_classes` to resolve again,
+    e.g. in tests.
+    """
+
+    instances = []
+
+    def __init__(self, model_attr):
+        self.model_attr = model_attr
+        self._model_classes = {}
+        self.instances.append(self)
+
+    def __get__(self, instance, owner):
+        model = getattr(instance or owner, self.model_attr)
+        try:
+            return self._model_classes[model]
+        except KeyError:
+            model_cls = django_apps.get_model(model)
+            if django_apps.ready:
+                self._model_classes[model] = model_cls
+            return model_cls
+
+    def reset(self):
+        self._model_classes = {}
+
+
+def reset_model_classes():
+    for model_class in ModelClass.instances:
+        model_class.reset()
@@ -0,0 +1,197 @@
+import csv
+import json
+import os
+
+from collections import namedtuple
+from django.apps import apps as django_apps
+from django.core.exceptions import NON_FIELD_ERRORS, ObjectDoesNotExist, ValidationError
+from itertools import groupby, islice
+
+from .batch import error_messages, validate_rows
+from .form_validators import DeceasedMemberFormValidator, HouseholdInfoFormValidator
+from .form_validators import HouseholdMemberFormValidator, HtcMemberFormValidator
+from .form_validators import MovedMemberFormValidator
+
+# {model label: form validator class} of importable models
+import_registry = {
+    'member.householdmember': HouseholdMemberFormValidator,
+    'member.movedmember': MovedMemberFormValidator,
+    'member.deceasedmember': DeceasedMemberFormValidator,
+    'member.householdinfo': HouseholdInfoFormValidator,
+    'member.htcmember': HtcMemberFormValidator,
+}
+
+# row is the row number in the file, from 1
+ValidationResult = namedtuple('ValidationResult', 'row errors error_codes')
+
+
+def read_csv(f):
+    yield from csv.DictReader(f)
+
+
+def read_jsonl(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_rows(f, file_format=None):
+    """Returns an iterator of rows, as dictionaries, from a CSV or
+    JSONL file object.
+
+    The format is taken from the file name if not given.
+    """
+    if not file_format:
+        file_format = os.path.splitext(getattr(f, 'name', ''))[1].lstrip('.')
+    if file_format == 'csv':
+        return read_csv(f)
+    elif file_format in ['jsonl', 'json']:
+        return read_jsonl(f)
+    raise ValueError(f'Invalid file format. Expected csv or jsonl. Got {file_format}.')
+
+
+class RowMapper:
+    """Maps a row to a cleaned_data dictionary for the model.
+
+    Values are converted with each field's `to_python`, related
+    fields by pk to model instances (fetched once while retained).
+    An empty value of a field that may not be blank is an error.
+    Columns that are not model fields are ignored.
+    """
+
+    def __init__(self, model_cls=None):
+        self.fields = {}
+        for field in model_cls._meta.concrete_fields:
+            self.fields[field.name] = field
+            self.fields[field.attname] = field
+        self.related_objects = {}
+
+    def cleaned_data(self, row):
+        """Returns a tuple of (cleaned_data, errors).
+        """
+        cleaned_data = {}
+        errors = {}
+        for name, value in row.items():
+            field = self.fields.get(name)
+            if not field:
+                continue
+            try:
+                if value is None or value == '':
+                    value = self.empty_value(field)
+                elif field.is_relation:
+                    value = self.related_object(field, value)
+                else:
+                    value = field.to_python(value)
+            except ValidationError as e:
+                errors[field.name] = e.messages
+            else:
+                cleaned_data[field.name] = value
+        return cleaned_data, errors
+
+    def empty_value(self, field):
+        """Returns the value of an empty cell, as a model form would,
+        or raises if the field may not be blank, e.g. a HoH's
+        age_in_years.
+        """
+        if not field.blank and field.editable:
+            raise ValidationError(field.error_messages['blank'], code='blank')
+        if field.empty_strings_allowed and not field.null:
+            return ''
+        return None
+
+    def related_object(self, field, pk):
+        key = (field.related_model, pk)
+        try:
+            return self.related_objects[key]
+        except KeyError:
+            try:
+                obj = field.related_model.objects.get(pk=pk)
+            except (ObjectDoesNotExist, ValueError):
+                raise ValidationError(f'{field.verbose_name} does not exist. Got {pk}.')
+            self.related_objects[key] = obj
+            return obj
+
+    def retain(self, *objs):
+        """Discards the fetched related objects other than objs,
+        e.g. those of the previous household.
+        """
+        self.related_objects = {
+            key: obj for key, obj in self.related_objects.items()
+            if any(obj is retained for retained in objs)}
+
+
+def _household_structure(item):
+    return item[1].get('household_structure')
+
+
+def _exception_result(e):
+    return {NON_FIELD_ERRORS: [f'{e.__class__.__name__}: {e}']}, ['error']
+
+
+def validate_chunk(form_validator_cls, rows):
+    """Returns a list of (errors, error_codes), one per row, as
+    validate_rows.
+
+    If validating the rows together raises an unexpected exception,
+    validates each row alone so that only the row that raises fails,
+    with a non-field error.
+    """
+    try:
+        return validate_rows(form_validator_cls, rows)
+    except Exception as e:
+        if len(rows) == 1:
+            return [_exception_result(e)]
+    results = []
+    for row in rows:
+        try:
+            results.extend(validate_rows(form_validator_cls, [row]))
+        except Exception as e:
+            results.append(_exception_result(e))
+    return results
+
+
+def validate_stream(rows, model=None, form_validator_cls=None, chunk_size=None):
+    """Yields a ValidationResult for each row of the model.
+
+    Consecutive rows of the same household structure are validated
+    together, in chunks of up to `chunk_size` rows, so that the
+    validator can prefetch per household. Only a chunk, and the
+    related objects of its household, are held in memory.
+    """
+    model_cls = django_apps.get_model(model)
+    form_validator_cls = form_validator_cls or import_registry[model]
+    chunk_size = chunk_size or 500
+    mapper = RowMapper(model_cls)
+    mapped = (
+        (number, *mapper.cleaned_data(row)) for number, row in enumerate(rows, 1))
+    for household_structure, group in groupby(mapped, key=_household_structure):
+        mapper.retain(household_structure)
+        while True:
+            chunk = list(islice(group, chunk_size))
+            if not chunk:
+                break
+            valid = [item for item in chunk if not item[2]]
+            results = dict(zip(
+                [number for number, _, _ in valid],
+                validate_chunk(
+                    form_validator_cls,
+                    [dict(cleaned_data=cleaned_data, instance=model_cls())
+                     for _, cleaned_data, _ in valid])))
+            for number, _, errors in chunk:
+                if errors:
+                    yield ValidationResult(number, errors, ['invalid'])
+                else:
+                    errors, error_codes = results[number]
+                    yield ValidationResult(
+                        number, error_messages(errors),
+                        [code for code in error_codes if code])
+
+
+def validate_file(path, model=None, form_validator_cls=None, file_format=None,
+                  chunk_size=None):
+    """Yields a ValidationResult for each row of a CSV or JSONL file.
+    """
+    with open(path, newline='') as f:
+        yield from validate_stream(
+            read_rows(f, file_format=file_format), model=model,
+            form_validator_cls=form_validator_cls, chunk_size=chunk_size)
@@ -0,0 +1,59 @@
+from threading import RLock
+
+
+class PreviousMemberIndex:
+    """An in-process index of enumerated household members by
+    household.
+
+    For each household (the lineage of household structures across
+    surveys), maps (first_name, initials) to the pks of the household
+    structures the member was enumerated in.
+
+    Entries are built lazily on first lookup with one query and are
+    invalidated on household member save/delete, see signals.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._index = {}
+        self._version = 0
+
+    def lookup(self, household_member_model_cls=None, household_structure=None,
+               first_name=None, initials=None):
+        """Returns a set of household structure pks for the household
+        in which a member with this first_name and initials was
+        enumerated.
+        """
+        household_id = household_structure.household_id
+        with self._lock:
+            members = self._index.get(household_id)
+            version = self._version
+        if members is None:
+            members = self._build(household_member_model_cls, household_id)
+            with self._lock:
+                if version == self._version:
+                    self._index[household_id] = members
+        return members.get((first_name, initials), set())
+
+    def invalidate(self, household_id=None):
+        with self._lock:
+            self._index.pop(household_id, None)
+            self._version += 1
+
+    def clear(self):
+        with self._lock:
+            self._index = {}
+            self._version += 1
+
+    def _build(self, household_member_model_cls, household_id):
+        members = {}
+        values = household_member_model_cls.objects.filter(
+            household_structure__household=household_id).values_list(
+                'household_structure', 'first_name', 'initials')
+        for household_structure_id, first_name, initials in values:
+            members.setdefault(
+                (first_name, initials), set()).add(household_structure_id)
+        return members
+
+
+previous_member_index = PreviousMemberIndex()
@@ -0,0 +1,37 @@
+from edc_constants.constants import FEMALE, MALE
+from member.choices import RELATIONS, FEMALE_RELATIONS, MALE_RELATIONS
+
+# {gender: frozenset of valid relations}, see load_relations_by_gender
+relations_by_gender = {}
+
+
+def load_relations_by_gender(relations=None, female_relations=None,
+                             male_relations=None):
+    """(Re)loads the lookup of valid relations by gender.
+
+    Call again if the relation choices are reloaded. The dictionary
+    is updated in place so existing references remain valid.
+    """
+    relations = relations or RELATIONS
+    female_relations = female_relations or FEMALE_RELATIONS
+    male_relations = male_relations or MALE_RELATIONS
+    relations_by_gender.update({
+        MALE: frozenset(
+            item[0] for item in relations if item not in female_relations),
+        FEMALE: frozenset(
+            item[0] for item in relations if item not in male_relations)})
+    return relations_by_gender
+
+
+def is_valid_relation(relation=None, gender=None):
+    """Returns True if the relation is valid for the gender.
+
+    Genders not in the lookup are not checked.
+    """
+    try:
+        return relation in relations_by_gender[gender]
+    except KeyError:
+        return True
+
+
+load_relations_by_gender()
@@ -0,0 +1,57 @@
+from threading import Lock
+from time import monotonic
+
+
+class RepresentativeEligibilityCache:
+    """A short-lived in-process set of the pks of household
+    structures known to have a representative eligibility.
+
+    Added to on a lookup that finds one, discarded on delete, see
+    signals, or when the entry expires.
+    """
+
+    timeout = 60  # seconds
+    max_entries = 10000
+
+    def __init__(self, timeout=None, max_entries=None):
+        self.timeout = timeout or self.timeout
+        self.max_entries = max_entries or self.max_entries
+        self._lock = Lock()
+        self._household_structures = {}
+
+    def exists(self, representative_eligibility_model_cls=None,
+               household_structure=None):
+        """Returns True if the household structure has a
+        representative eligibility.
+        """
+        pk = getattr(household_structure, 'pk', household_structure)
+        if self._household_structures.get(pk, 0) > monotonic():
+            return True
+        exists = representative_eligibility_model_cls.objects.filter(
+            household_structure=pk).exists()
+        if exists:
+            self.add(pk)
+        return exists
+
+    def add(self, household_structure_id=None):
+        with self._lock:
+            if len(self._household_structures) >= self.max_entries:
+                now = monotonic()
+                self._household_structures = {
+                    pk: expires for pk, expires in self._household_structures.items()
+                    if expires > now}
+                if len(self._household_structures) >= self.max_entries:
+                    self._household_structures = {}
+            self._household_structures[household_structure_id] = (
+                monotonic() + self.timeout)
+
+    def discard(self, household_structure_id=None):
+        with self._lock:
+            self._household_structures.pop(household_structure_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._household_structures = {}
+
+
+representative_eligibility_cache = RepresentativeEligibilityCache()
@@ -0,0 +1,82 @@
+import hashlib
+import json
+
+from datetime import date, datetime
+from threading import RLock
+from time import monotonic
+
+
+def _value(value):
+    if hasattr(value, '_meta') and hasattr(value, 'pk'):
+        return [value._meta.label_lower, str(value.pk)]
+    elif isinstance(value, (date, datetime)):
+        return value.isoformat()
+    elif isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def fingerprint(cleaned_data):
+    """Returns a stable hash of a cleaned_data dictionary, model
+    instances by label and pk.
+    """
+    return hashlib.sha1(json.dumps(
+        {k: _value(v) for k, v in cleaned_data.items()},
+        sort_keys=True).encode()).hexdigest()
+
+
+class ValidationResultCache:
+    """A short-lived in-process cache of form validation verdicts by
+    key and household.
+
+    Entries of a household are invalidated when any record the
+    verdict depends on changes, see signals.
+    """
+
+    timeout = 300  # seconds
+    max_entries = 10000
+
+    def __init__(self, timeout=None, max_entries=None):
+        self.timeout = timeout or self.timeout
+        self.max_entries = max_entries or self.max_entries
+        self._lock = RLock()
+        self._results = {}
+        self._households = {}
+
+    def get(self, key):
+        """Returns the cached verdict or raises KeyError.
+        """
+        with self._lock:
+            expires, household_id, verdict = self._results[key]
+        if expires < monotonic():
+            raise KeyError(key)
+        return verdict
+
+    def set(self, key, household_id=None, verdict=None):
+        with self._lock:
+            if len(self._results) >= self.max_entries:
+                self._purge()
+            self._results[key] = (monotonic() + self.timeout, household_id, verdict)
+            self._households.setdefault(household_id, set()).add(key)
+
+    def invalidate(self, household_id=None):
+        with self._lock:
+            for key in self._households.pop(household_id, set()):
+                self._results.pop(key, None)
+
+    def _purge(self):
+        now = monotonic()
+        for key, (expires, household_id, _) in list(self._results.items()):
+            if expires < now:
+                del self._results[key]
+                self._households.get(household_id, set()).discard(key)
+        if len(self._results) >= self.max_entries:
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._results = {}
+            self._households = {}
+
+
+validation_result_cache = ValidationResultCache()
@@ -0,0 +1,111 @@
+import django
+import os
+
+from collections import deque
+from django.apps import apps as django_apps
+from django.db import connections
+from multiprocessing import Pool
+
+from .batch import error_messages, validate_rows
+from .form_validators import DeceasedMemberFormValidator, HouseholdInfoFormValidator
+from .form_validators import HouseholdMemberFormValidator, MovedMemberFormValidator
+
+
+class RevalidationHouseholdMemberFormValidator(HouseholdMemberFormValidator):
+
+    # an existing member with a completed enrollment checklist may not
+    # be changed on the form but is not invalid.
+    pure_checks = [
+        check for check in HouseholdMemberFormValidator.pure_checks
+        if check != 'validate_enrollment_checklist_completed']
+
+
+# {model label: (form validator class, related fields to select)}
+revalidation_registry = {
+    'member.householdmember': (
+        RevalidationHouseholdMemberFormValidator, ['household_structure']),
+    'member.movedmember': (MovedMemberFormValidator, ['household_member']),
+    'member.deceasedmember': (DeceasedMemberFormValidator, ['household_member']),
+    'member.householdinfo': (HouseholdInfoFormValidator, ['household_structure']),
+}
+
+
+def instance_to_cleaned_data(obj):
+    """Returns a cleaned_data dictionary of the model instance's
+    field values, related fields as model instances.
+    """
+    return {field.name: getattr(obj, field.name)
+            for field in obj._meta.concrete_fields}
+
+
+def revalidate(label, pks):
+    """Returns a list of failures, as (label, pk, error_codes,
+    error messages), for the model instances.
+    """
+    form_validator_cls, related_fields = revalidation_registry[label]
+    model_cls = django_apps.get_model(label)
+    objs = list(
+        model_cls.objects.filter(pk__in=pks).select_related(*related_fields))
+    rows = [dict(cleaned_data=instance_to_cleaned_data(obj), instance=obj)
+            for obj in objs]
+    results = validate_rows(form_validator_cls, rows)
+    return [
+        (label, str(obj.pk), [code for code in error_codes if code],
+         error_messages(errors))
+        for obj, (errors, error_codes) in zip(objs, results)
+        if errors or error_codes]
+
+
+def _revalidate(args):
+    return revalidate(*args)
+
+
+def _init_worker():
+    if not django_apps.ready:
+        django.setup()
+
+
+def chunked_pks(label, chunk_size=None):
+    """Yields (label, list of pks) streamed from the database in
+    chunks.
+    """
+    chunk_size = chunk_size or 1000
+    model_cls = django_apps.get_model(label)
+    pks = []
+    for pk in model_cls.objects.order_by().values_list('pk', flat=True).iterator():
+        pks.append(pk)
+        if len(pks) == chunk_size:
+            yield label, pks
+            pks = []
+    if pks:
+        yield label, pks
+
+
+def revalidate_all(labels=None, processes=None, chunk_size=None):
+    """Yields failures, see `revalidate`, for all instances of each
+    model in labels.
+
+    Chunks of instances are validated in a pool of `processes`
+    worker processes, each with its own database connection, or in
+    this process if `processes` is 1. Only a few chunks per worker
+    are read ahead.
+    """
+    labels = labels or list(revalidation_registry)
+    chunks = (chunk for label in labels for chunk in chunked_pks(label, chunk_size))
+    if processes == 1:
+        for chunk in chunks:
+            yield from _revalidate(chunk)
+    else:
+        # close connections so that forked workers open their own
+        connections.close_all()
+        # chunks are read in this thread and submitted with at most
+        # two per worker in flight
+        max_pending = 2 * (processes or os.cpu_count() or 1)
+        pending = deque()
+        with Pool(processes=processes, initializer=_init_worker) as pool:
+            for chunk in chunks:
+                pending.append(pool.apply_async(_revalidate, (chunk,)))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
@@ -0,0 +1,115 @@
+from collections import namedtuple
+
+from edc_base.modelform_validators import FormValidator
+
+from .instrumentation import instrumentation
+
+
+class Rule(namedtuple('Rule', 'check responses field target')):
+    """A field rule evaluated by calling FormValidator method `check`,
+    e.g. `required_if`, with the rule's responses, field and target
+    field.
+
+    Declare rules with `required_if`, `required_if_not_none`,
+    `applicable_if`, `not_applicable_if` and `other_specify` below.
+    """
+
+    __slots__ = ()
+
+    target_kwargs = {
+        'required_if': 'field_required',
+        'required_if_not_none': 'field_required',
+        'applicable_if': 'field_applicable',
+        'not_applicable_if': 'field_applicable',
+        'validate_other_specify': 'other_specify_field'}
+
+    def evaluate(self, form_validator):
+        getattr(form_validator, self.check)(
+            *self.responses, field=self.field,
+            **{self.target_kwargs[self.check]: self.target})
+
+    def as_dict(self):
+        return dict(
+            check=self.check, responses=list(self.responses),
+            field=self.field, target=self.target)
+
+
+def required_if(*responses, field=None, field_required=None):
+    return Rule('required_if', responses, field, field_required)
+
+
+def required_if_not_none(field=None, field_required=None):
+    return Rule('required_if_not_none', (), field, field_required)
+
+
+def applicable_if(*responses, field=None, field_applicable=None):
+    return Rule('applicable_if', responses, field, field_applicable)
+
+
+def not_applicable_if(*responses, field=None, field_applicable=None):
+    return Rule('not_applicable_if', responses, field, field_applicable)
+
+
+def other_specify(field=None, other_specify_field=None):
+    """Returns a rule for the OTHER/Other specify field pattern, the
+    other specify field defaults to "<field>_other".
+    """
+    return Rule(
+        'validate_other_specify', (), field, other_specify_field or f'{field}_other')
+
+
+def compile_rules(rules):
+    """Returns a flat tuple of rules, in declared order, without
+    duplicates.
+
+    Nested lists or tuples of rules are flattened.
+    """
+    compiled_rules = []
+    for rule in rules:
+        if isinstance(rule, Rule):
+            rules_ = [rule]
+        else:
+            rules_ = compile_rules(rule)
+        for rule_ in rules_:
+            if rule_ not in compiled_rules:
+                compiled_rules.append(rule_)
+    return tuple(compiled_rules)
+
+
+class RuleFormValidator(FormValidator):
+    """A form validator that evaluates the field rules declared on
+    class attribute `rules`.
+
+    Rules are compiled once, at class creation, into `compiled_rules`.
+    """
+
+    rules = ()
+    compiled_rules = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled_rules = compile_rules(cls.rules)
+
+    @classmethod
+    def export_rules(cls):
+        """Returns the compiled rules as a list of dictionaries, e.g.
+        for clients to evaluate the same rules.
+        """
+        return [rule.as_dict() for rule in cls.compiled_rules]
+
+    def clean(self):
+        if instrumentation.enabled:
+            instrumentation.run(self, 'validate_rules', self.validate_rules)
+        else:
+            self.validate_rules()
+
+    def validate_rules(self):
+        for rule in self.compiled_rules:
+            rule.evaluate(self)
+
+    async def avalidate(self, executor=None):
+        """Async counterpart of `validate`.
+
+        Field rules do not query so are evaluated in the event loop.
+        """
+        return self.validate()
@@ -0,0 +1,34 @@
+import hashlib
+import json
+
+from .form_validators import DeceasedMemberFormValidator, HouseholdInfoFormValidator
+from .form_validators import HouseholdMemberFormValidator, HtcMemberFormValidator
+from .form_validators import MovedMemberFormValidator
+
+# increment if the format of the rules document changes
+RULES_DOCUMENT_VERSION = 1
+
+exported_form_validators = [
+    DeceasedMemberFormValidator,
+    HouseholdInfoFormValidator,
+    HouseholdMemberFormValidator,
+    HtcMemberFormValidator,
+    MovedMemberFormValidator,
+]
+
+
+def rules_document(form_validators=None):
+    """Returns a dictionary of the field rules of each form validator
+    that clients can evaluate before posting a form.
+
+    Only rules that do not query the database are included.
+    `revision` changes whenever any rule changes.
+    """
+    form_validators = form_validators or exported_form_validators
+    validators = {
+        form_validator_cls.__name__: form_validator_cls.export_rules()
+        for form_validator_cls in form_validators}
+    revision = hashlib.sha256(
+        json.dumps(validators, sort_keys=True).encode()).hexdigest()[:12]
+    return dict(
+        version=RULES_DOCUMENT_VERSION, revision=revision, validators=validators)
@@ -0,0 +1,80 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .household_log_entry_cache import household_log_entry_cache
+from .household_snapshot import discard_household_snapshots
+from .previous_member_index import previous_member_index
+from .representative_eligibility_cache import representative_eligibility_cache
+from .result_cache import validation_result_cache
+
+
+def get_household_id(instance):
+    """Returns the household pk of the instance's household structure
+    without loading the household structure if not already loaded.
+    """
+    descriptor = instance.__class__.household_structure
+    if descriptor.is_cached(instance):
+        return instance.household_structure.household_id
+    return descriptor.field.related_model.objects.filter(
+        pk=instance.household_structure_id).values_list('household', flat=True).first()
+
+
+def get_household_structure_id(instance):
+    """Returns the household structure pk of the household log entry
+    instance's household log without loading the household log if not
+    already loaded.
+    """
+    descriptor = instance.__class__.household_log
+    if descriptor.is_cached(instance):
+        return instance.household_log.household_structure_id
+    return descriptor.field.related_model.objects.filter(
+        pk=instance.household_log_id).values_list(
+            'household_structure', flat=True).first()
+
+
+@receiver([post_save, post_delete], weak=False, sender='member.householdmember',
+          dispatch_uid='household_member_on_post_save_or_delete')
+def household_member_on_post_save_or_delete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        household_id = get_household_id(instance)
+        previous_member_index.invalidate(household_id=household_id)
+        validation_result_cache.invalidate(household_id=household_id)
+        discard_household_snapshots(household_id=household_id)
+
+
+@receiver([post_save, post_delete], weak=False, sender='member.deceasedmember',
+          dispatch_uid='deceased_member_on_post_save_or_delete')
+def deceased_member_on_post_save_or_delete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        household_member_model_cls = sender.household_member.field.related_model
+        values = household_member_model_cls.objects.filter(
+            pk=instance.household_member_id).values_list(
+                'household_structure', 'household_structure__household').first()
+        if values:
+            household_structure_id, household_id = values
+            validation_result_cache.invalidate(household_id=household_id)
+            discard_household_snapshots(household_structure_id=household_structure_id)
+
+
+@receiver([post_save, post_delete], weak=False, sender='household.householdlogentry',
+          dispatch_uid='household_log_entry_on_post_save_or_delete')
+def household_log_entry_on_post_save_or_delete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        household_structure_id = get_household_structure_id(instance)
+        household_log_entry_cache.invalidate(household_structure_id=household_structure_id)
+        discard_household_snapshots(household_structure_id=household_structure_id)
+
+
+@receiver(post_save, weak=False, sender='member.representativeeligibility',
+          dispatch_uid='representative_eligibility_on_post_save')
+def representative_eligibility_on_post_save(sender, instance, raw, **kwargs):
+    if not raw:
+        discard_household_snapshots(household_structure_id=instance.household_structure_id)
+
+
+@receiver(post_delete, weak=False, sender='member.representativeeligibility',
+          dispatch_uid='representative_eligibility_on_post_delete')
+def representative_eligibility_on_post_delete(sender, instance, **kwargs):
+    representative_eligibility_cache.discard(
+        household_structure_id=instance.household_structure_id)
+    discard_household_snapshots(household_structure_id=instance.household_structure_id)
@@ -0,0 +1,65 @@
+import json
+import os
+import tracemalloc
+
+from collections import namedtuple
+from django import forms
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from time import perf_counter
+
+
+BASELINES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'benchmark_baselines.json')
+
+Measurement = namedtuple('Measurement', 'queries seconds peak_kb')
+
+
+def measure(func, repeat=1):
+    """Returns a Measurement of the queries, wall time (seconds) and
+    peak allocations (KB) of calling func `repeat` times.
+
+    Validation errors are expected and ignored.
+    """
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as context:
+            start = perf_counter()
+            for _ in range(repeat):
+                try:
+                    func()
+                except forms.ValidationError:
+                    pass
+            seconds = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return Measurement(len(context.captured_queries), seconds, peak / 1024)
+
+
+class Baselines:
+    """Recorded maximum query counts by benchmark name.
+
+    Set environment variable BENCHMARK_RECORD=1 to (re)record the
+    baselines from a run.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename or BASELINES_FILE
+        self.record = bool(os.environ.get('BENCHMARK_RECORD'))
+        try:
+            with open(self.filename) as f:
+                self.baselines = json.load(f)
+        except FileNotFoundError:
+            self.baselines = {}
+
+    def get(self, name):
+        return self.baselines.get(name)
+
+    def update(self, name, queries):
+        self.baselines[name] = queries
+
+    def save(self):
+        with open(self.filename, 'w') as f:
+            json.dump(self.baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
@@ -0,0 +1,194 @@
+import os
+import sys
+
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+from model_mommy import mommy
+
+from edc_base.utils import get_utcnow
+from edc_constants.constants import ALIVE, MALE, NO, YES
+from edc_map.site_mappers import site_mappers
+from member.models import HouseholdMember
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..form_validators import DeceasedMemberFormValidator, HouseholdInfoFormValidator
+from ..form_validators import HouseholdMemberFormValidator, HtcMemberFormValidator
+from ..form_validators import MovedMemberFormValidator
+from ..household_log_entry_cache import household_log_entry_cache
+from ..previous_member_index import previous_member_index
+from ..representative_eligibility_cache import representative_eligibility_cache
+from ..result_cache import validation_result_cache
+from .benchmark import Baselines, measure
+
+
+@tag('benchmark')
+class TestBenchmarks(TestCase):
+    """Reports the queries, wall time and peak allocations of each
+    form validator and fails if the queries exceed the recorded
+    baseline or there is none.
+
+    Configure with environment variables BENCHMARK_MEMBERS (members
+    per household per survey), BENCHMARK_SURVEY_ROUNDS and
+    BENCHMARK_REPEAT. Record baselines with BENCHMARK_RECORD=1.
+
+    Excluded from the test job in CI, run with --tag benchmark.
+    """
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    members = int(os.environ.get('BENCHMARK_MEMBERS', 10))
+    survey_rounds = int(os.environ.get('BENCHMARK_SURVEY_ROUNDS', 2))
+    repeat = int(os.environ.get('BENCHMARK_REPEAT', 1))
+
+    baselines = Baselines()
+    results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.baselines.record:
+            cls.baselines.save()
+        sys.stdout.write(
+            f'\nBenchmarks (members={cls.members}, survey_rounds={cls.survey_rounds}, '
+            f'repeat={cls.repeat})\n')
+        for name, m in sorted(cls.results.items()):
+            sys.stdout.write(
+                f'  {name:<45} queries={m.queries:<5} '
+                f'seconds={m.seconds:.4f} peak_kb={m.peak_kb:.1f}\n')
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        household_log_entry_cache.clear()
+        previous_member_index.clear()
+        representative_eligibility_cache.clear()
+        validation_result_cache.clear()
+        self.household_structure = self.make_household()
+        self.today_datetime = self.household_structure.report_datetime
+
+    def make_household(self):
+        """Returns the household structure of the latest survey round
+        after enumerating `members` in it and in each previous round.
+        """
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        for survey_round in range(self.survey_rounds):
+            if survey_round > 0:
+                if not household_structure.next:
+                    break
+                household_structure = household_structure.next
+                mommy.make_recipe(
+                    'household.householdlogentry',
+                    household_log=household_structure.householdlog,
+                    report_datetime=household_structure.report_datetime)
+            for _ in range(self.members):
+                self.member_helper.add_household_member(household_structure)
+        return household_structure
+
+    def benchmark(self, name, func):
+        m = measure(func, repeat=self.repeat)
+        self.results[name] = m
+        # baselines are recorded per configuration
+        key = f'{name}:{self.members}:{self.survey_rounds}:{self.repeat}'
+        baseline = self.baselines.get(key)
+        if self.baselines.record:
+            self.baselines.update(key, m.queries)
+        elif baseline is None:
+            self.fail(f'No baseline for {key}. Record with BENCHMARK_RECORD=1.')
+        else:
+            self.assertLessEqual(
+                m.queries, baseline,
+                msg=f'{name} queries exceed baseline. Got {m.queries} > {baseline}.')
+        return m
+
+    def household_member_cleaned_data(self, **options):
+        cleaned_data = dict(
+            household_structure=self.household_structure,
+            first_name='ERIK',
+            initials='EX',
+            gender=MALE,
+            age_in_years=25,
+            relation='husband',
+            survival_status=ALIVE,
+            present_today=NO)
+        cleaned_data.update(**options)
+        return cleaned_data
+
+    def test_household_member_new(self):
+        def func():
+            HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=self.household_member_cleaned_data(),
+                instance=HouseholdMember()).validate()
+        self.benchmark('household_member_new', func)
+
+    def test_household_member_existing(self):
+        household_member = HouseholdMember.objects.filter(
+            household_structure=self.household_structure).first()
+
+        def func():
+            HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=self.household_member_cleaned_data(
+                    first_name=household_member.first_name,
+                    initials=household_member.initials),
+                instance=household_member).validate()
+        self.benchmark('household_member_existing', func)
+
+    def test_household_member_field_error(self):
+        def func():
+            HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=self.household_member_cleaned_data(initials='XX'),
+                instance=HouseholdMember()).validate()
+        self.benchmark('household_member_field_error', func)
+
+    def test_household_member_validate_many(self):
+        rows = [
+            dict(cleaned_data=self.household_member_cleaned_data(
+                first_name=obj.first_name, initials=obj.initials),
+                instance=obj)
+            for obj in HouseholdMember.objects.filter(
+                household_structure=self.household_structure)]
+
+        def func():
+            HouseholdMemberFormValidator.validate_many(
+                rows, today_datetime=self.today_datetime)
+        self.benchmark('household_member_validate_many', func)
+
+    def test_household_info(self):
+        def func():
+            HouseholdInfoFormValidator(
+                cleaned_data=dict(household_structure=self.household_structure),
+                instance=None).validate()
+        self.benchmark('household_info', func)
+
+    def test_moved_member(self):
+        household_member = HouseholdMember.objects.filter(
+            household_structure=self.household_structure).first()
+
+        def func():
+            MovedMemberFormValidator(
+                cleaned_data=dict(has_moved=YES, moved_community=NO),
+                instance=household_member).validate()
+        self.benchmark('moved_member', func)
+
+    def test_deceased_member(self):
+        def func():
+            DeceasedMemberFormValidator(
+                cleaned_data=dict(
+                    extra_death_info='blah blah', extra_death_info_date=get_utcnow()),
+                instance=None).validate()
+        self.benchmark('deceased_member', func)
+
+    def test_htc_member(self):
+        def func():
+            HtcMemberFormValidator(
+                cleaned_data=dict(accepted=NO, refusal_reason='blah'),
+                instance=None).validate()
+        self.benchmark('htc_member', func)
@@ -0,0 +1,87 @@
+from django import forms
+from django.test import SimpleTestCase, tag
+from edc_constants.constants import YES, NO, NOT_APPLICABLE, OTHER
+from itertools import combinations, product
+from unittest import skipUnless
+
+from ..columnar import Columns, evaluate_rules, np
+from ..form_validators import DeceasedMemberFormValidator, HouseholdInfoFormValidator
+from ..form_validators import HouseholdMemberFormValidator, HtcMemberFormValidator
+from ..form_validators import MovedMemberFormValidator
+from ..rules import RuleFormValidator, applicable_if, not_applicable_if, required_if
+
+
+@tag('columnar')
+@skipUnless(np, 'numpy is not installed')
+class TestColumnar(SimpleTestCase):
+
+    values = [YES, NO, NOT_APPLICABLE, OTHER, None, '', 'blah']
+
+    def rows(self, rules):
+        fields = sorted(set(
+            field for rule in rules for field in [rule.field, rule.target]))
+        # every combination of values of up to three fields, others
+        # None or missing from cleaned_data
+        rows = []
+        for selected in combinations(fields, min(3, len(fields))):
+            for values in product(self.values, repeat=len(selected)):
+                row = dict(zip(selected, values))
+                rows.append(row)
+                rows.append(dict(dict.fromkeys(fields), **row))
+        return rows
+
+    def failing_rows(self, rules, rows):
+        """Returns {rule: set of failing row indices} evaluating row
+        by row with a form validator.
+        """
+        failing = {}
+        for index, row in enumerate(rows):
+            form_validator = RuleFormValidator(cleaned_data=row, instance=None)
+            for rule in rules:
+                try:
+                    rule.evaluate(form_validator)
+                except forms.ValidationError:
+                    failing.setdefault(rule, set()).add(index)
+        return failing
+
+    def test_same_as_form_validators(self):
+        for form_validator_cls in [
+                HtcMemberFormValidator, MovedMemberFormValidator,
+                DeceasedMemberFormValidator, HouseholdMemberFormValidator,
+                HouseholdInfoFormValidator]:
+            rules = form_validator_cls.compiled_rules
+            rows = self.rows(rules)
+            with self.subTest(form_validator_cls=form_validator_cls):
+                failures = evaluate_rules(rules, Columns.from_rows(rows))
+                self.assertEqual(
+                    {failure.rule: set(failure.rows.tolist()) for failure in failures},
+                    self.failing_rows(rules, rows))
+                for failure in failures:
+                    self.assertEqual(failure.field, failure.rule.target)
+
+    def test_missing_column(self):
+        failures = evaluate_rules(
+            HtcMemberFormValidator.rules, dict(offered=[YES, NO], referred=[NO, NO]))
+        self.assertEqual(
+            [(failure.field, failure.rows.tolist()) for failure in failures],
+            [('referred', [1])])
+
+    def test_missing_keys(self):
+        rules = [
+            required_if(YES, field='a', field_required='b'),
+            applicable_if(YES, field='a', field_applicable='c'),
+            not_applicable_if(YES, field='a', field_applicable='b')]
+        rows = [dict(a=YES, c=NOT_APPLICABLE),
+                dict(a=NO, b='x', c=NOT_APPLICABLE),
+                dict(b='x')]
+        failures = evaluate_rules(rules, Columns.from_rows(rows))
+        self.assertEqual(
+            [(failure.rule.check, failure.field, failure.rows.tolist())
+             for failure in failures],
+            [('required_if', 'b', [0, 1]), ('applicable_if', 'c', [0])])
+        self.assertEqual(
+            {failure.rule: set(failure.rows.tolist()) for failure in failures},
+            self.failing_rows(rules, rows))
+
+    def test_columns_of_equal_length(self):
+        self.assertRaises(ValueError, Columns, dict(offered=[YES], referred=[]))
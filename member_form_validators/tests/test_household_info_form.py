@@ -0,0 +1,57 @@
+from django import forms
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from member.models import RepresentativeEligibility
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..form_validators import HouseholdInfoFormValidator
+from ..representative_eligibility_cache import RepresentativeEligibilityCache
+from ..representative_eligibility_cache import representative_eligibility_cache
+
+
+@tag('household_info')
+class TestHouseholdInfoFormValidator(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        representative_eligibility_cache.clear()
+        self.cache = RepresentativeEligibilityCache()
+
+    def form_validator(self):
+        form_validator = HouseholdInfoFormValidator(
+            cleaned_data=dict(household_structure=self.household_structure),
+            instance=None)
+        form_validator.representative_eligibility_cache = self.cache
+        return form_validator
+
+    def test_representative_eligibility_cached(self):
+        self.form_validator().validate()
+        with self.assertNumQueries(0):
+            self.form_validator().validate()
+
+    def test_representative_eligibility_deleted(self):
+        self.cache = representative_eligibility_cache
+        self.form_validator().validate()
+        RepresentativeEligibility.objects.get(
+            household_structure=self.household_structure).delete()
+        self.assertRaises(forms.ValidationError, self.form_validator().validate)
+
+    def test_representative_eligibility_expires(self):
+        # entries expire as they are added
+        self.cache = RepresentativeEligibilityCache(timeout=-1)
+        self.form_validator().validate()
+        self.assertEqual(len(self.cache._household_structures), 1)
+        with self.assertNumQueries(1):
+            self.form_validator().validate()
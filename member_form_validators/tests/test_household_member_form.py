@@ -1,6 +1,11 @@
+import asyncio
+
+from concurrent.futures import Executor, Future
 from django import forms
 from django.apps import apps as django_apps
+from django.db import connection
 from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
 from uuid import uuid4
 
 from edc_base.utils import get_utcnow
@@ -15,6 +20,24 @@ from member.tests import MemberTestHelper, TestMapper
 from survey.tests import SurveyTestHelper
 
 from ..form_validators import HouseholdMemberFormValidator
+from ..household_log_entry_cache import HouseholdLogEntryCache, household_log_entry_cache
+from ..household_structures import get_previous_household_structures
+from ..instrumentation import CollectorSink, instrumentation
+from ..result_cache import ValidationResultCache
+from ..revalidation import instance_to_cleaned_data
+
+
+class InlineExecutor(Executor):
+    """Runs in the calling thread, and so in the test transaction.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
 
 
 @tag('form')
@@ -379,3 +402,281 @@ class TestHouseholdMemberFormValidator(TestCase):
             instance=HouseholdMember(id=uuid4(), eligible_hoh=True))
         self.assertRaises(forms.ValidationError, form_validator.validate)
         self.assertIn('present_today', form_validator._errors)
+
+    def test_form_validator_no_household_structure(self):
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=dict(first_name='ERIK', initials='EX'),
+            instance=HouseholdMember())
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('household_log_entry', form_validator._error_codes)
+
+    def test_form_validator_refused_enumeration_after_cached_log_entry(self):
+        """Asserts a cached household log entry is invalidated when
+        the log entry is saved.
+        """
+        cleaned_data = dict(household_structure=self.household_structure)
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=cleaned_data,
+            instance=HouseholdMember(),
+            household_log_entry_cache=household_log_entry_cache)
+        form_validator.validate()
+        obj = self.household_structure.householdlog.householdlogentry_set.all().last()
+        obj.household_status = REFUSED_ENUMERATION
+        obj.save()
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=cleaned_data,
+            instance=HouseholdMember(),
+            household_log_entry_cache=household_log_entry_cache)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('refused_enumeration', form_validator._error_codes)
+
+    def test_validate_many(self):
+        defaults = dict(
+            household_structure=self.household_structure,
+            gender=MALE)
+        rows = [
+            dict(cleaned_data=dict(
+                first_name='ERIK', initials='EX', relation='husband', **defaults),
+                instance=HouseholdMember()),
+            dict(cleaned_data=dict(
+                first_name='ERIK', initials='XX', relation='husband', **defaults),
+                instance=HouseholdMember()),
+            dict(cleaned_data=dict(
+                first_name='ERIK', initials='EX', relation='wife', **defaults),
+                instance=HouseholdMember())]
+        results = HouseholdMemberFormValidator.validate_many(
+            rows, today_datetime=self.today_datetime)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], ({}, []))
+        self.assertIn('initials', results[1][0])
+        self.assertIn('relation', results[2][0])
+
+    def test_validate_many_prefetches_each_household_structure_object(self):
+        household_structures = [
+            self.household_structure.__class__.objects.get(
+                pk=self.household_structure.pk) for _ in range(2)]
+        rows = [
+            dict(cleaned_data=dict(
+                household_structure=household_structure, first_name='ERIK',
+                initials='EX', relation='husband', gender=MALE),
+                instance=HouseholdMember())
+            for household_structure in household_structures]
+        HouseholdMemberFormValidator.validate_many(
+            rows, today_datetime=self.today_datetime)
+        for household_structure in household_structures:
+            self.assertTrue(hasattr(household_structure, '_previous_household_structures'))
+
+    def test_form_validator_field_errors_before_queries(self):
+        cleaned_data = dict(
+            household_structure=self.household_structure,
+            first_name='ERIK',
+            initials='XX',
+            relation='husband',
+            gender=MALE)
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=cleaned_data,
+            instance=HouseholdMember())
+        with self.assertNumQueries(0):
+            self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('initials', form_validator._errors)
+
+    def test_form_validator_collect_all_errors(self):
+        cleaned_data = dict(
+            household_structure=self.household_structure,
+            first_name='ERIK',
+            initials='XX',
+            relation='wife',
+            gender=MALE,
+            survival_status=ALIVE,
+            present_today=NOT_APPLICABLE)
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=cleaned_data,
+            instance=HouseholdMember(),
+            collect_all_errors=True)
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('initials', form_validator._errors)
+        self.assertIn('relation', form_validator._errors)
+        self.assertIn('present_today', form_validator._errors)
+
+    def test_form_validator_instrumentation(self):
+        sink = CollectorSink()
+        instrumentation.add_sink(sink)
+        try:
+            cleaned_data = dict(household_structure=self.household_structure)
+            HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=cleaned_data,
+                instance=HouseholdMember()).validate()
+        finally:
+            instrumentation.remove_sink(sink)
+        stats = sink.flush()
+        self.assertGreater(
+            stats['HouseholdMemberFormValidator.validate_household_log_entry']['queries'], 0)
+        self.assertIn(
+            'HouseholdMemberFormValidator.validate_member_integrity_with_previous', stats)
+        self.assertEqual(
+            stats['HouseholdMemberFormValidator.validate_relation_and_gender']['queries'], 0)
+        self.assertFalse(instrumentation.enabled)
+
+    def test_previous_household_structures_memoised(self):
+        previous_structures = get_previous_household_structures(
+            self.household_structure)
+        self.assertEqual(
+            [obj.pk for obj in previous_structures],
+            [obj.pk for obj in self.walk_previous(self.household_structure)])
+        with self.assertNumQueries(0):
+            get_previous_household_structures(self.household_structure)
+
+    def walk_previous(self, household_structure):
+        previous_structures = []
+        while household_structure:
+            household_structure = household_structure.previous
+            if household_structure:
+                previous_structures.append(household_structure)
+        return previous_structures
+
+    def test_form_validator_avalidate(self):
+        loop = asyncio.get_event_loop()
+        for cleaned_data, expected in [
+                (dict(household_structure=self.household_structure,
+                      relation='wife', gender=MALE), 'relation'),
+                (dict(household_structure=self.household_structure,
+                      first_name='ERIK', initials='EX', gender=MALE,
+                      survival_status=ALIVE, present_today=NOT_APPLICABLE),
+                 'present_today')]:
+            form_validator = HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=cleaned_data,
+                instance=HouseholdMember())
+            with self.assertRaises(forms.ValidationError):
+                loop.run_until_complete(
+                    form_validator.avalidate(executor=InlineExecutor()))
+            self.assertEqual(list(form_validator._errors), [expected])
+
+    def test_form_validator_avalidate_log_entry(self):
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=get_utcnow(),
+            cleaned_data=dict(household_structure=self.household_structure),
+            instance=HouseholdMember())
+        with self.assertRaises(forms.ValidationError):
+            asyncio.get_event_loop().run_until_complete(
+                form_validator.avalidate(executor=InlineExecutor()))
+        self.assertIn('household_log_entry', form_validator._error_codes)
+
+    def test_form_validator_result_cache(self):
+        """Asserts an unchanged resubmission is a cache hit without
+        queries and revalidated, with its queries, once invalidated.
+        """
+        result_cache = ValidationResultCache()
+        household_log_entry_cache = HouseholdLogEntryCache()
+        household_member = self.member_helper.add_household_member(
+            self.household_structure)
+        cleaned_data = dict(
+            household_structure=self.household_structure,
+            first_name=household_member.first_name,
+            initials=household_member.initials,
+            gender=household_member.gender,
+            age_in_years=household_member.age_in_years,
+            survival_status=ALIVE)
+
+        def validate():
+            form_validator = HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=cleaned_data,
+                instance=household_member,
+                household_log_entry_cache=household_log_entry_cache)
+            form_validator.result_cache = result_cache
+            form_validator.validate()
+            return form_validator
+
+        form_validator = validate()
+        key = form_validator.result_cache_key()
+        self.assertEqual(result_cache.get(key), ({}, [], None))
+        with self.assertNumQueries(0):
+            cached_form_validator = validate()
+        self.assertEqual(cached_form_validator._errors, form_validator._errors)
+        self.assertEqual(
+            cached_form_validator._error_codes, form_validator._error_codes)
+        result_cache.invalidate(household_id=self.household_structure.household_id)
+        with self.assertRaises(KeyError):
+            result_cache.get(key)
+        # the deceased member query of validate_survival_status
+        with CaptureQueriesContext(connection) as context:
+            validate()
+        self.assertGreater(len(context.captured_queries), 0)
+        self.assertEqual(result_cache.get(key), ({}, [], None))
+
+    def test_form_validator_result_cache_db_check_error(self):
+        """Asserts the errors of a failed database-backed check are
+        replayed from the cache without queries.
+        """
+        obj = self.household_structure.householdlog.householdlogentry_set.all().last()
+        obj.household_status = REFUSED_ENUMERATION
+        obj.save()
+        result_cache = ValidationResultCache()
+        household_log_entry_cache = HouseholdLogEntryCache()
+        cleaned_data = dict(
+            household_structure=self.household_structure,
+            first_name='ERIK',
+            initials='EX',
+            gender=MALE)
+
+        def validate():
+            form_validator = HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=cleaned_data,
+                instance=HouseholdMember(),
+                household_log_entry_cache=household_log_entry_cache)
+            form_validator.result_cache = result_cache
+            self.assertRaises(forms.ValidationError, form_validator.validate)
+            return form_validator
+
+        form_validator = validate()
+        self.assertIn('refused_enumeration', form_validator._error_codes)
+        with self.assertNumQueries(0):
+            cached_form_validator = validate()
+        self.assertEqual(cached_form_validator._errors, form_validator._errors)
+        self.assertEqual(
+            cached_form_validator._error_codes, form_validator._error_codes)
+
+    def test_form_validator_result_cache_field_error_before_queries(self):
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=dict(
+                household_structure=self.household_structure,
+                first_name='ERIK', initials='XX'),
+            instance=HouseholdMember())
+        form_validator.result_cache = ValidationResultCache()
+        form_validator.household_log_entry_cache = None
+        with self.assertNumQueries(0):
+            self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('initials', form_validator._errors)
+
+    def test_form_validator_incremental(self):
+        household_member = self.member_helper.add_household_member(
+            self.household_structure)
+        # invalid but unchanged from the instance
+        household_member.initials = 'QQ'
+        cleaned_data = instance_to_cleaned_data(household_member)
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=cleaned_data,
+            instance=household_member,
+            incremental=True)
+        self.assertEqual(form_validator.changed_fields, set())
+        form_validator.validate()
+        for incremental, data in [
+                (False, cleaned_data),
+                (True, dict(cleaned_data, first_name='ZED'))]:
+            form_validator = HouseholdMemberFormValidator(
+                today_datetime=self.today_datetime,
+                cleaned_data=data,
+                instance=household_member,
+                incremental=incremental)
+            self.assertRaises(forms.ValidationError, form_validator.validate)
+            self.assertIn('initials', form_validator._errors)
@@ -0,0 +1,101 @@
+from django import forms
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_constants.constants import MALE
+from edc_map.site_mappers import site_mappers
+from member.models import HouseholdMember
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..form_validators import HouseholdInfoFormValidator, HouseholdMemberFormValidator
+from ..household_snapshot import HouseholdSnapshot, get_household_snapshot
+from ..household_snapshot import household_visit
+
+
+@tag('snapshot')
+class TestHouseholdSnapshot(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        self.today_datetime = self.household_structure.report_datetime
+
+    def validate_member(self, first_name=None, initials=None):
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=dict(
+                household_structure=self.household_structure,
+                first_name=first_name, initials=initials, gender=MALE),
+            instance=HouseholdMember(),
+            collect_all_errors=True)
+        try:
+            form_validator.validate()
+        except forms.ValidationError:
+            pass
+        return form_validator
+
+    def test_get_household_snapshot(self):
+        self.assertIsNone(get_household_snapshot(self.household_structure))
+        with household_visit():
+            household_snapshot = get_household_snapshot(self.household_structure)
+            self.assertIsNotNone(household_snapshot)
+            self.assertIs(
+                get_household_snapshot(self.household_structure.pk), household_snapshot)
+        self.assertIsNone(get_household_snapshot(self.household_structure))
+
+    def test_shared_by_validators(self):
+        with household_visit():
+            form_validator = self.validate_member('ERIK', 'EX')
+            self.assertIs(
+                form_validator.household_snapshot,
+                get_household_snapshot(self.household_structure))
+            with self.assertNumQueries(0):
+                self.validate_member('ANNA', 'AX')
+            HouseholdInfoFormValidator(
+                cleaned_data=dict(household_structure=self.household_structure),
+                instance=None).validate()
+            self.assertTrue(
+                form_validator.household_snapshot.representative_eligibility_exists)
+
+    def test_passed_to_validators(self):
+        household_snapshot = HouseholdSnapshot(self.household_structure)
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=dict(household_structure=self.household_structure),
+            instance=HouseholdMember(),
+            household_snapshot=household_snapshot)
+        self.assertIs(
+            form_validator.get_previous_household_structures(),
+            household_snapshot.previous_household_structures)
+        household_snapshot._representative_eligibility_exists = False
+        form_validator = HouseholdInfoFormValidator(
+            cleaned_data=dict(household_structure=self.household_structure),
+            instance=None,
+            household_snapshot=household_snapshot)
+        with self.assertNumQueries(0):
+            self.assertRaises(forms.ValidationError, form_validator.validate)
+
+    def test_passed_without_household_structure(self):
+        form_validator = HouseholdMemberFormValidator(
+            today_datetime=self.today_datetime,
+            cleaned_data=dict(first_name='ERIK', initials='EX'),
+            instance=HouseholdMember(),
+            household_snapshot=HouseholdSnapshot(self.household_structure))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('household_log_entry', form_validator._error_codes)
+
+    def test_discarded_on_household_member_save(self):
+        with household_visit():
+            household_snapshot = get_household_snapshot(self.household_structure)
+            self.member_helper.add_household_member(self.household_structure)
+            self.assertIsNot(
+                get_household_snapshot(self.household_structure), household_snapshot)
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase, tag
+
+from .. import form_validators
+
+# times importing the package in a new interpreter and lists the
+# dependencies that were imported
+IMPORT_SCRIPT = """
+import json, sys
+from time import perf_counter
+start = perf_counter()
+import member_form_validators.form_validators
+seconds = perf_counter() - start
+print(json.dumps(dict(seconds=seconds, modules=sorted(sys.modules))))
+"""
+
+
+@tag('benchmark')
+class TestImports(SimpleTestCase):
+    """Reports the seconds to import the form validators package and
+    fails if it imports a validator or its dependencies eagerly.
+
+    Set environment variable BENCHMARK_IMPORT_SECONDS to also fail
+    if the import is slower.
+    """
+
+    eager_modules = [
+        'household.exceptions',
+        'household.utils',
+        'member.choices',
+        'member_form_validators.form_validators.household_member',
+        'member_form_validators.form_validators.htc_member']
+
+    def test_import_is_lazy(self):
+        output = subprocess.check_output(
+            [sys.executable, '-c', IMPORT_SCRIPT],
+            cwd=os.path.dirname(os.path.dirname(form_validators.__path__[0])))
+        result = json.loads(output.decode())
+        sys.stdout.write(
+            f'\nImport member_form_validators.form_validators '
+            f'seconds={result["seconds"]:.4f}\n')
+        for module in self.eager_modules:
+            self.assertNotIn(module, result['modules'])
+        max_seconds = os.environ.get('BENCHMARK_IMPORT_SECONDS')
+        if max_seconds:
+            self.assertLessEqual(result['seconds'], float(max_seconds))
+
+    def test_attributes(self):
+        self.assertIn('HtcMemberFormValidator', dir(form_validators))
+        self.assertEqual(
+            form_validators.HtcMemberFormValidator.__module__,
+            'member_form_validators.form_validators.htc_member')
+        self.assertRaises(AttributeError, getattr, form_validators, 'Unknown')
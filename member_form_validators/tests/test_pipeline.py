@@ -0,0 +1,90 @@
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+from edc_constants.constants import MALE
+from member.constants import HEAD_OF_HOUSEHOLD
+from io import StringIO
+from uuid import uuid4
+
+from edc_map.site_mappers import site_mappers
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..pipeline import read_rows, validate_chunk, validate_stream
+
+
+class FirstNameFormValidator:
+
+    def __init__(self, cleaned_data=None, instance=None):
+        self.cleaned_data = cleaned_data
+        self._errors = {}
+        self._error_codes = []
+
+    def validate(self):
+        if not self.cleaned_data.get('first_name'):
+            raise TypeError('Expected a first name.')
+
+
+@tag('pipeline')
+class TestPipeline(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+
+    def test_read_rows(self):
+        f = StringIO('first_name,initials\nERIK,EX\n')
+        self.assertEqual(
+            list(read_rows(f, file_format='csv')),
+            [dict(first_name='ERIK', initials='EX')])
+        f = StringIO('{"first_name": "ERIK", "initials": "EX"}\n\n')
+        self.assertEqual(
+            list(read_rows(f, file_format='jsonl')),
+            [dict(first_name='ERIK', initials='EX')])
+        self.assertRaises(ValueError, read_rows, f, file_format='xls')
+
+    def test_validate_stream(self):
+        pk = str(self.household_structure.pk)
+        report_datetime = self.household_structure.report_datetime.isoformat()
+        rows = [
+            dict(household_structure=pk, first_name='ERIK', initials='EX',
+                 gender=MALE, relation='husband', report_datetime=report_datetime,
+                 unknown_column='ignored'),
+            dict(household_structure=pk, first_name='ERIK', initials='XX',
+                 gender=MALE, relation='husband', report_datetime=report_datetime),
+            dict(household_structure=str(uuid4()), first_name='ERIK', initials='EX',
+                 gender=MALE, relation='husband', report_datetime=report_datetime),
+            dict(household_structure='', first_name='ERIK', initials='EX',
+                 gender=MALE, relation='husband', report_datetime=report_datetime)]
+        results = list(validate_stream(
+            rows, model='member.householdmember', chunk_size=1))
+        self.assertEqual([result.row for result in results], [1, 2, 3, 4])
+        self.assertEqual(results[0].errors, {})
+        self.assertIn('initials', results[1].errors)
+        self.assertIn('household_structure', results[2].errors)
+        self.assertIn('household_structure', results[3].errors)
+
+    def test_validate_stream_blank(self):
+        pk = str(self.household_structure.pk)
+        report_datetime = self.household_structure.report_datetime.isoformat()
+        rows = [
+            dict(household_structure=pk, first_name='ERIK', initials='EX',
+                 gender=MALE, relation=HEAD_OF_HOUSEHOLD, age_in_years='',
+                 report_datetime=report_datetime)]
+        results = list(validate_stream(rows, model='member.householdmember'))
+        self.assertIn('age_in_years', results[0].errors)
+        self.assertEqual(results[0].error_codes, ['invalid'])
+
+    def test_validate_chunk_isolates_exceptions(self):
+        rows = [dict(cleaned_data=dict(first_name=first_name), instance=None)
+                for first_name in ['ERIK', None, 'ZED']]
+        results = validate_chunk(FirstNameFormValidator, rows)
+        self.assertEqual(
+            [error_codes for _, error_codes in results], [[], ['error'], []])
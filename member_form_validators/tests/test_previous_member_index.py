@@ -0,0 +1,71 @@
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from member.models import HouseholdMember
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..previous_member_index import PreviousMemberIndex, previous_member_index
+
+
+@tag('index')
+class TestPreviousMemberIndex(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        self.household_member = self.member_helper.add_household_member(
+            self.household_structure)
+
+    def tearDown(self):
+        previous_member_index.clear()
+
+    def test_lookup(self):
+        index = PreviousMemberIndex()
+        self.assertEqual(
+            index.lookup(
+                household_member_model_cls=HouseholdMember,
+                household_structure=self.household_structure,
+                first_name=self.household_member.first_name,
+                initials=self.household_member.initials),
+            {self.household_structure.pk})
+        self.assertEqual(
+            index.lookup(
+                household_member_model_cls=HouseholdMember,
+                household_structure=self.household_structure,
+                first_name='NOBODY',
+                initials='NX'),
+            set())
+
+    def test_lookup_builds_once(self):
+        index = PreviousMemberIndex()
+        opts = dict(
+            household_member_model_cls=HouseholdMember,
+            household_structure=self.household_structure,
+            first_name=self.household_member.first_name,
+            initials=self.household_member.initials)
+        index.lookup(**opts)
+        with self.assertNumQueries(0):
+            index.lookup(**opts)
+
+    def test_invalidated_on_save(self):
+        opts = dict(
+            household_member_model_cls=HouseholdMember,
+            household_structure=self.household_structure,
+            first_name='NOBODY',
+            initials='NX')
+        self.assertEqual(previous_member_index.lookup(**opts), set())
+        self.household_member.first_name = 'NOBODY'
+        self.household_member.initials = 'NX'
+        self.household_member.save()
+        self.assertEqual(
+            previous_member_index.lookup(**opts), {self.household_structure.pk})
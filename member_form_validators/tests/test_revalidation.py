@@ -0,0 +1,50 @@
+import json
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.test import TestCase, tag
+from io import StringIO
+
+from edc_map.site_mappers import site_mappers
+from member.tests import MemberTestHelper, TestMapper
+from survey.tests import SurveyTestHelper
+
+from ..revalidation import revalidate
+
+
+@tag('revalidation')
+class TestRevalidation(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        self.household_member = self.member_helper.add_household_member(
+            self.household_structure)
+
+    def test_revalidate_invalid(self):
+        self.household_member.__class__.objects.filter(
+            pk=self.household_member.pk).update(initials='XX')
+        failures = revalidate('member.householdmember', [self.household_member.pk])
+        self.assertEqual(len(failures), 1)
+        label, pk, _, errors = failures[0]
+        self.assertEqual(pk, str(self.household_member.pk))
+        self.assertIn('initials', errors)
+
+    def test_command(self):
+        self.household_member.__class__.objects.filter(
+            pk=self.household_member.pk).update(initials='XX')
+        out = StringIO()
+        call_command(
+            'revalidate_members', '--model', 'member.householdmember',
+            '--processes', '1', stdout=out, stderr=StringIO())
+        failures = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertIn(
+            str(self.household_member.pk), [failure['pk'] for failure in failures])
@@ -0,0 +1,81 @@
+from django import forms
+from django.test import SimpleTestCase, tag
+from edc_constants.constants import YES, NO, NOT_APPLICABLE, OTHER, MALE, FEMALE
+
+from ..form_validators import HouseholdInfoFormValidator, MovedMemberFormValidator
+from ..form_validators import HouseholdMemberFormValidator
+from ..rules import RuleFormValidator, compile_rules, other_specify
+from ..rules_export import RULES_DOCUMENT_VERSION, rules_document
+from ..rules import applicable_if, not_applicable_if, required_if
+
+
+@tag('rules')
+class TestRules(SimpleTestCase):
+
+    def test_compile_rules_flattens(self):
+        rules = compile_rules([
+            required_if(YES, field='f1', field_required='f2'),
+            [applicable_if(YES, field='f1', field_applicable=f) for f in ['f3', 'f4']]])
+        self.assertEqual([rule.target for rule in rules], ['f2', 'f3', 'f4'])
+
+    def test_compile_rules_removes_duplicates(self):
+        rules = compile_rules([
+            not_applicable_if(YES, field='f1', field_applicable='f2'),
+            not_applicable_if(YES, field='f1', field_applicable='f2')])
+        self.assertEqual(len(rules), 1)
+
+    def test_moved_member_rules_compiled(self):
+        self.assertEqual(len(MovedMemberFormValidator.compiled_rules), 5)
+
+    def test_rule_form_validator(self):
+
+        class MyFormValidator(RuleFormValidator):
+            rules = (
+                required_if(NO, field='accepted', field_required='refusal_reason'),
+                applicable_if(YES, field='offered', field_applicable='referred'))
+
+        form_validator = MyFormValidator(
+            cleaned_data=dict(accepted=NO, refusal_reason=None))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('refusal_reason', form_validator._errors)
+        form_validator = MyFormValidator(
+            cleaned_data=dict(offered=YES, referred=NOT_APPLICABLE))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('referred', form_validator._errors)
+
+    def test_other_specify(self):
+
+        class MyFormValidator(RuleFormValidator):
+            rules = (other_specify('water_source'), )
+
+        form_validator = MyFormValidator(
+            cleaned_data=dict(water_source=OTHER, water_source_other=None))
+        self.assertRaises(forms.ValidationError, form_validator.validate)
+        self.assertIn('water_source_other', form_validator._errors)
+
+    def test_export_rules(self):
+        self.assertIn(
+            dict(check='validate_other_specify', responses=[],
+                 field='flooring_type', target='flooring_type_other'),
+            HouseholdInfoFormValidator.export_rules())
+
+    def test_rules_document(self):
+        document = rules_document()
+        self.assertEqual(document.get('version'), RULES_DOCUMENT_VERSION)
+        self.assertEqual(document.get('revision'), rules_document().get('revision'))
+        self.assertEqual(
+            sorted(document.get('validators')),
+            ['DeceasedMemberFormValidator', 'HouseholdInfoFormValidator',
+             'HouseholdMemberFormValidator', 'HtcMemberFormValidator',
+             'MovedMemberFormValidator'])
+        checks = [rule.get('check') for rule in
+                  document.get('validators').get('HouseholdMemberFormValidator')]
+        self.assertIn('applicable_if', checks)
+        self.assertIn('validate_relation_and_gender', checks)
+
+    def test_export_relation_messages(self):
+        rule = [rule for rule in HouseholdMemberFormValidator.export_rules()
+                if rule.get('check') == 'validate_relation_and_gender'][0]
+        self.assertEqual(rule.get('messages').get(MALE), 'Invalid relation for male.')
+        self.assertEqual(
+            rule.get('messages').get(FEMALE), 'Invalid relation for female.')
@@ -0,0 +1,55 @@
+import logging
+
+from collections import deque
+from random import random
+from time import perf_counter
+
+
+class Trace:
+    """A trace of the hops of a walk, e.g. along the chain of
+    previous household structures, with the seconds per hop.
+    """
+
+    def __init__(self, name=None, tracer=None):
+        self.name = name
+        self.tracer = tracer
+        self.hops = []
+        self._last = perf_counter()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(name={self.name}, hops={self.hops})'
+
+    def hop(self, label=None):
+        now = perf_counter()
+        self.hops.append((label, now - self._last))
+        self._last = now
+
+    def finish(self):
+        self.tracer.record(self)
+
+
+class Tracer:
+    """Starts sampled traces and keeps the most recent.
+
+    Off by default, set `sample_rate` between 0 and 1 to trace.
+    Finished traces are logged at DEBUG and kept in `traces`.
+    """
+
+    def __init__(self, sample_rate=None, max_traces=None, logger=None):
+        self.sample_rate = sample_rate or 0
+        self.traces = deque(maxlen=max_traces or 100)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def start_trace(self, name=None):
+        """Returns a new Trace or None if not sampled.
+        """
+        if self.sample_rate and random() < self.sample_rate:
+            return Trace(name=name, tracer=self)
+        return None
+
+    def record(self, trace):
+        self.traces.append(trace)
+        self.logger.debug('%r', trace)
+
+
+tracer = Tracer()
@@ -21,6 +21,7 @@ setup(
     description='Form validators for the member module',
     long_description=README,
     zip_safe=False,
+    extras_require={'columnar': ['numpy']},
     keywords='django survey member form validators',
     classifiers=[
         'Environment :: Web Environment',